@@ -0,0 +1,35 @@
+import sys 
+sys.path.append("code/")
+
+import unittest 
+from grid import Grid
+from solver import *
+
+class SolverTestCase(unittest.TestCase):
+    """
+    Base class of the tests of the optimal solvers, with the checks they all share
+    """
+    file_names = ["input/grid00.in", "input/grid05.in", "input/grid17.in"]
+
+    def assertValidSolution(self, grid, pairs): # valid pairs, no cell in two pairs
+        cells = [cell for pair in pairs for cell in pair]
+        self.assertEqual(len(cells), len(set(cells)))
+        self.assertTrue(all(grid.is_valid_pair(*c1, *c2) for (c1, c2) in pairs))
+
+    def assertSameScoreAsScipy(self, make_solver, file_names=None):
+        """
+        Runs make_solver(grid) on each grid (file_names, by default self.file_names) and checks that its solution is valid 
+        and has the score of SolverScipy (maybe not with the same pairs in case of a tie). 
+        Returns the solvers, for the checks specific to each one.
+        """
+        solvers = []
+        for file_name in file_names or self.file_names:
+            grid = Grid.grid_from_file(file_name,read_values=True)
+            scipy_solver = SolverScipy(grid)
+            scipy_solver.run()
+            s = make_solver(grid)
+            s.run()
+            self.assertEqual(s.score(), scipy_solver.score(), file_name)
+            self.assertValidSolution(grid, s.pairs)
+            solvers.append(s)
+        return solvers
@@ -0,0 +1,87 @@
+import sys 
+sys.path.append("code/")
+
+import unittest 
+from grid import Grid
+
+
+class Test_AllPairs(unittest.TestCase):
+    def test_small_grid(self):
+        grid = Grid.grid_from_file("input/grid01.in",read_values=True)
+        pairs = [((0, 0), (1, 0)), ((0, 2), (1, 2)), ((1, 0), (1, 1)), ((1, 1), (1, 2))]
+        self.assertEqual(grid.all_pairs(), pairs)
+
+    def test_edge_arrays(self):
+        grid = Grid.grid_from_file("input/grid01.in",read_values=True,as_array=True)
+        u, v, weight = grid.edge_arrays()
+        self.assertEqual(u.tolist(), [0, 2, 3, 4])
+        self.assertEqual(v.tolist(), [3, 5, 4, 5])
+        self.assertEqual(weight.tolist(), [6, 1, 10, 2])
+
+    def test_same_as_is_valid_pair(self): # every valid pair must be found, in row-major order
+        grid = Grid.grid_from_file("input/grid17.in",read_values=True)
+        pairs = []
+        for i in range(grid.n):
+            for j in range(grid.m): 
+                if grid.is_valid_pair(i, j, i+1, j):
+                    pairs.append(((i, j), (i+1, j)))
+                if grid.is_valid_pair(i, j, i, j+1):
+                    pairs.append(((i, j), (i, j+1)))
+        self.assertEqual(grid.all_pairs(), pairs)
+
+    def test_are_valid_pairs(self): # the array version must agree with is_valid_pair, out of the grid cells included
+        grid = Grid.grid_from_file("input/grid05.in",read_values=True)
+        i1, j1, i2, j2 = [], [], [], []
+        for i in range(-1, grid.n + 1):
+            for j in range(-1, grid.m + 1):
+                for (di, dj) in [(0, 0), (1, 0), (0, 1), (1, 1)]:
+                    i1.append(i); j1.append(j); i2.append(i + di); j2.append(j + dj)
+        valid = grid.are_valid_pairs(i1, j1, i2, j2).tolist()
+        for k in range(len(i1)):
+            self.assertEqual(valid[k], grid.is_valid_pair(i1[k], j1[k], i2[k], j2[k]))
+
+    def test_adjacency(self):
+        grid = Grid.grid_from_file("input/grid01.in",read_values=True)
+        indptr, indices, weights = grid.adjacency()
+        self.assertEqual(indptr.tolist(), [0, 1, 1, 2, 4, 6, 8])
+        self.assertEqual(indices[indptr[3]:indptr[4]].tolist(), [0, 4]) # neighbours of the cell (1, 0)
+        self.assertEqual(weights[indptr[3]:indptr[4]].tolist(), [6, 10])
+        self.assertIs(grid.adjacency(), grid.adjacency()) # computed only once
+
+    def test_cache_invalidation(self):
+        grid = Grid.grid_from_file("input/grid01.in",read_values=True)
+        self.assertEqual(len(grid.all_pairs()), 4)
+        grid.set_color(1, 1, 4) # (1, 1) becomes black
+        self.assertEqual(grid.all_pairs(), [((0, 0), (1, 0)), ((0, 2), (1, 2))])
+        grid.value = [[1, 1, 1], [1, 1, 1]]
+        self.assertEqual(grid.edge_arrays()[2].tolist(), [0, 0])
+        grid.color[1][1] = 0 # in place modifications need an explicit invalidation
+        grid.invalidate_cache()
+        self.assertEqual(len(grid.all_pairs()), 4)
+        pairs = [((0, 0), (1, 0))]
+        score = grid.score(pairs)
+        grid.value[0][2] = 5 # the scores of a list-backed grid always read the current lists
+        self.assertEqual(grid.score(pairs), score + 4)
+        self.assertEqual(grid.score([]), grid.total_value())
+
+    def test_cell_ids(self):
+        grid = Grid(2, 3)
+        self.assertEqual(grid.cell_id(1, 2), 5)
+        self.assertEqual(grid.cell_of(5), (1, 2))
+        pairs = [((0, 0), (1, 0)), ((1, 1), (1, 2))]
+        u, v = grid.pairs_to_ids(pairs)
+        self.assertEqual((u.tolist(), v.tolist()), ([0, 4], [3, 5]))
+        self.assertEqual(grid.ids_to_pairs(u, v), pairs)
+
+    def test_iter_edges(self): # the bands put together give edge_arrays
+        grid = Grid.grid_from_file("input/grid17.in",read_values=True)
+        u, v, weight = grid.edge_arrays()
+        bands = list(grid.iter_edges(band_rows=3))
+        self.assertEqual(len(bands), 4)
+        self.assertEqual(sum([band[0].tolist() for band in bands], []), u.tolist())
+        self.assertEqual(sum([band[1].tolist() for band in bands], []), v.tolist())
+        self.assertEqual(sum([band[2].tolist() for band in bands], []), weight.tolist())
+
+
+if __name__ == '__main__':
+    unittest.main()
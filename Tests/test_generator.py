@@ -0,0 +1,39 @@
+import sys 
+sys.path.append("code/")
+
+import os
+import tempfile
+import unittest 
+from grid import Grid
+from generator import generate_grid, write_grid_file
+
+
+class Test_Generator(unittest.TestCase):
+    def test_reproducible(self):
+        grid1 = generate_grid(20, 30, black_density=0.5, value_range=(1, 9), seed=42)
+        grid2 = generate_grid(20, 30, black_density=0.5, value_range=(1, 9), seed=42)
+        self.assertEqual((grid1.n, grid1.m), (20, 30))
+        self.assertEqual(grid1.color.tolist(), grid2.color.tolist())
+        self.assertEqual(grid1.value.tolist(), grid2.value.tolist())
+        self.assertTrue(1 <= grid1.value.min() and grid1.value.max() <= 9)
+
+    def test_parameters(self):
+        grid = generate_grid(10, 10, black_density=1.0, seed=0)
+        self.assertEqual(grid.all_pairs(), []) # every cell is black
+        grid = generate_grid(10, 10, color_weights=(0, 0, 0, 1), seed=0)
+        self.assertEqual(set(grid.color.ravel().tolist()), {3}) # only green cells
+        with self.assertRaises(ValueError): # the values would not fit in VALUE_DTYPE
+            generate_grid(2, 2, value_range=(1, 3000000000), seed=0)
+
+    def test_file_gives_same_grid(self):
+        grid = generate_grid(15, 25, black_density=0.3, color_weights=(4, 1, 1, 1), value_range=(1, 100), seed=7)
+        with tempfile.TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, "random.in")
+            write_grid_file(file_name, 15, 25, black_density=0.3, color_weights=(4, 1, 1, 1), value_range=(1, 100), seed=7)
+            grid_from_file = Grid.grid_from_file(file_name, read_values=True)
+        self.assertEqual(grid_from_file.color, grid.color.tolist())
+        self.assertEqual(grid_from_file.value, grid.value.tolist())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,6 +2,10 @@
 import sys 
 sys.path.append("code/")
 import unittest 
+import gzip
+import lzma
+import os
+import tempfile
 from grid import Grid
 from solver import *
 
@@ -29,6 +33,73 @@ class Test_GridLoading(unittest.TestCase):
         self.assertEqual(grid.color, [[0, 4, 3], [2, 1, 0]])
         self.assertEqual(grid.value, [[5, 8, 4], [11, 1, 3]])
 
+    def test_grid1_as_array(self):
+        grid = Grid.grid_from_file("input/grid01.in",read_values=True,as_array=True)
+        self.assertEqual(grid.is_array_backed(), True)
+        self.assertEqual(grid.color.shape, (2, 3))
+        self.assertEqual(grid.color.tolist(), [[0, 4, 3], [2, 1, 0]])
+        self.assertEqual(grid.value.tolist(), [[5, 8, 4], [11, 1, 3]])
+        self.assertEqual(grid.color[0][1], 4) # the list-style indexing still works
+        self.assertEqual(grid.cost(((0,0),(1,0))), 6)
+
+    def test_errors_give_line_number(self):
+        contents = {"2 3\n0 0 0\n0 5 0\n": "Invalid color on line 3",
+                    "2 3\n0 0 0\n0 0\n": "Format incorrect on line 3",
+                    "2 3\n0 0 0\n0 0 0\n1 2 3\n1 a 3\n": "Format incorrect on line 5",
+                    "1 2\n0 0\n3000000000 1\n": "Format incorrect on line 3", # does not fit in VALUE_DTYPE
+                    "1 2\n0 0\n1 99999999999999999999\n": "Format incorrect on line 3", # does not fit in int64
+                    "1 2\n0 0\n1 + 3\n": "Format incorrect on line 3", # a sign must be followed by a digit
+                    "1 2\n0 0\n1 3+3\n": "Format incorrect on line 3"}
+        for content, message in contents.items():
+            with tempfile.TemporaryDirectory() as directory:
+                file_name = os.path.join(directory, "grid.in")
+                with open(file_name, "w") as file:
+                    file.write(content)
+                with self.assertRaises(Exception) as context:
+                    Grid.grid_from_file(file_name, read_values=True)
+                self.assertTrue(str(context.exception).startswith(message))
+
+    def test_signs(self): # the integers are read as int() does
+        with tempfile.TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, "grid.in")
+            with open(file_name, "w") as file:
+                file.write("1 3\n+0 1 +2\n+5 -12 +345\n")
+            grid = Grid.grid_from_file(file_name, read_values=True)
+        self.assertEqual((grid.color, grid.value), ([[0, 1, 2]], [[5, -12, 345]]))
+
+    def test_binary_round_trip(self):
+        with tempfile.TemporaryDirectory() as directory:
+            file_name = Grid.convert_to_binary("input/grid05.in", os.path.join(directory, "grid05.bin"))
+            grid = Grid.grid_from_binary(file_name)
+            expected = Grid.grid_from_file("input/grid05.in", read_values=True)
+            self.assertEqual((grid.n, grid.m), (expected.n, expected.m))
+            self.assertEqual(grid.color.tolist(), expected.color)
+            self.assertEqual(grid.value.tolist(), expected.value)
+            self.assertEqual(grid.all_pairs(), expected.all_pairs())
+            del grid # releases the memory map before the directory is removed
+
+    def test_compressed_files(self):
+        expected = Grid.grid_from_file("input/grid17.in", read_values=True)
+        with open("input/grid17.in", "rb") as file:
+            content = file.read()
+        with tempfile.TemporaryDirectory() as directory:
+            for name, open_compressed in [("grid17.in.gz", gzip.open), ("grid17.in.xz", lzma.open)]:
+                file_name = os.path.join(directory, name)
+                with open_compressed(file_name, "wb") as file:
+                    file.write(content)
+                grid = Grid.grid_from_file(file_name, read_values=True)
+                self.assertEqual(grid.color, expected.color)
+                self.assertEqual(grid.value, expected.value)
+
+    def test_fingerprint(self):
+        grid = Grid.grid_from_file("input/grid05.in", read_values=True)
+        same_grid = Grid.grid_from_file("input/grid05.in", read_values=True, as_array=True)
+        self.assertEqual(grid.fingerprint(), same_grid.fingerprint()) # the storage does not change the fingerprint
+        self.assertNotEqual(grid.fingerprint(), Grid.grid_from_file("input/grid04.in", read_values=True).fingerprint())
+        fingerprint = grid.fingerprint()
+        grid.set_value(0, 0, grid.value[0][0] + 1)
+        self.assertNotEqual(grid.fingerprint(), fingerprint)
+
     def test_grid3(self):
         grid = Grid.grid_from_file("input/grid03.in",read_values=True)
         self.assertEqual(grid.n, 4)
@@ -2,7 +2,8 @@ import sys
 sys.path.append("code/")
 
 import unittest 
-from grid import Grid
+from grid import Grid, ScoreTracker
+import numpy as np
 from solver import *
 
 class Test_score(unittest.TestCase):
@@ -16,6 +17,58 @@ class Test_score(unittest.TestCase):
         s.pairs = [((0,0),(1,0)),((0,2),(1,2))]#We test one possibility of score 8
         self.assertEqual(s.score(), 8)
 
+    def test_grid_score(self): # the score only depends on the pairs, not on their container
+        grid = Grid.grid_from_file("input/grid17.in",read_values=True)
+        pairs = grid.all_pairs()[::7]
+        s = SolverEmpty(grid)
+        s.pairs = pairs
+        self.assertEqual(grid.score(set(pairs)), s.score())
+        self.assertEqual(grid.score([]), grid.total_value())
+        self.assertEqual(type(s.score()), int)
+
+    def test_score_tracker(self):
+        grid = Grid.grid_from_file("input/grid05.in",read_values=True)
+        tracker = ScoreTracker(grid)
+        self.assertEqual(tracker.score, grid.total_value())
+        pairs = [((0, 0), (1, 0)), ((0, 2), (0, 3)), ((2, 1), (3, 1))] # valid disjoint pairs
+        for pair in pairs:
+            tracker.add_pair(pair)
+        self.assertEqual(tracker.score, grid.score(pairs))
+        tracker.remove_pair(pairs[1])
+        self.assertEqual(tracker.score, grid.score([pairs[0], pairs[2]]))
+        self.assertTrue(pairs[0] in tracker and pairs[1] not in tracker)
+        tracker.clear()
+        self.assertEqual((tracker.score, len(tracker)), (grid.total_value(), 0))
+
+    def test_batch_score(self):
+        grid = Grid.grid_from_file("input/grid05.in",read_values=True)
+        pairs = grid.all_pairs()
+        greedy = SolverGreedy(grid)
+        greedy.run()
+        solutions = [[], pairs[:1], [((0, 0), (1, 0)), ((0, 2), (0, 3)), ((2, 1), (3, 1))], greedy.pairs]
+        solution, u, v = grid.solutions_to_ids(solutions)
+        expected = [grid.score(pairs) for pairs in solutions]
+        self.assertEqual(grid.batch_score(solution, u, v, k=4, validate=True).tolist(), expected)
+        used = np.zeros((4, grid.n * grid.m), dtype=bool)
+        used[solution, u] = used[solution, v] = True
+        self.assertEqual(grid.batch_score(solution, u, v, k=4, used=used, validate=True).tolist(), expected)
+        solution, u, v = grid.solutions_to_ids([pairs[:1], [], []]) # k is taken from used, not from solution
+        used = np.zeros((3, grid.n * grid.m), dtype=bool)
+        used[solution, u] = used[solution, v] = True
+        expected = [grid.score(pairs[:1]), grid.total_value(), grid.total_value()]
+        self.assertEqual(grid.batch_score(solution, u, v, used=used).tolist(), expected)
+        with self.assertRaises(Exception): # the candidate 0 is not in range(k)
+            grid.batch_score(solution, u, v, k=0)
+        with self.assertRaises(Exception): # the two pairs share the cell (0, 0)
+            grid.batch_score(*grid.solutions_to_ids([[pairs[0], ((0, 0), (0, 1))]]), validate=True)
+
+    def test_lower_bound(self):
+        grid = Grid.grid_from_file("input/grid00.in",read_values=True)
+        s = SolverEmpty(grid)
+        self.assertEqual(s.lower_bound(), 9) # 32 - (8 + 8 + 4 + 1 + 1 + 1)
+        s.pairs = [((0, 0), (0, 1)), ((0, 2), (1, 2)), ((1, 0), (1, 1))]
+        self.assertTrue(s.lower_bound() <= s.score())
+
 
 if __name__ == '__main__':
     unittest.main()
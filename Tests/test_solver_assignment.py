@@ -0,0 +1,66 @@
+import sys 
+sys.path.append("code/")
+
+import unittest 
+from grid import Grid
+from solver import *
+from solver_test_case import SolverTestCase
+
+class Test_SolverAssignment(SolverTestCase):
+    def test_cost_matrix(self): # the matrix is the one filled pair by pair with list.index
+        grid = Grid.grid_from_file("input/grid05.in",read_values=True)
+        s = SolverScipy(grid)
+        expected = np.zeros((len(s.cases_paires), len(s.cases_impaires)))
+        for ((a, b), (c, d)) in grid.all_pairs():
+            if (a + b) % 2 == 1:
+                (a, b), (c, d) = (c, d), (a, b)
+            g, h = grid.value[a][b], grid.value[c][d]
+            expected[s.cases_paires.index((a, b))][s.cases_impaires.index((c, d))] = abs(g - h) - g - h
+        expected = expected + abs(np.min(expected))
+        self.assertTrue(np.array_equal(s.matrice, expected))
+        self.assertEqual(s.indices[grid.cell_id(1, 3)], s.cases_paires.index((1, 3)))
+        self.assertEqual(s.indices[grid.cell_id(2, 3)], s.cases_impaires.index((2, 3)))
+
+    def test_compact(self): # same solution with an integer matrix and working copy, 8 times smaller
+        grid = Grid.grid_from_file("input/grid04.in",read_values=True)
+        s = SolverHungarian(grid)
+        s.run()
+        c = SolverHungarian(grid, compact=True)
+        c.run()
+        self.assertEqual(c.matrice.dtype, np.int8)
+        self.assertTrue(np.array_equal(s.matrice, c.matrice))
+        self.assertEqual(c.pairs, s.pairs)
+
+    def test_rectangular(self): # more even cells than odd ones: the matrix is not padded
+        grid = Grid(3, 3, value=[[1, 5, 2], [3, 1, 4], [2, 2, 6]])
+        for solver in [SolverHungarian(grid), SolverHungarian(grid, compact=True), SolverScipy(grid)]:
+            self.assertEqual(solver.matrice.shape, (5, 4))
+            solver.run()
+            self.assertEqual(solver.score(), 8) # e.g. ((0, 2), (0, 1)), ((0, 0), (1, 0)), ((2, 0), (2, 1)), ((2, 2), (1, 2)) and (1, 1) alone
+
+    def test_vectorized(self): # same steps with masks, so the same pairs in the same order
+        for file_name in ["input/grid04.in", "input/grid05.in"]:
+            grid = Grid.grid_from_file(file_name,read_values=True)
+            s = SolverHungarian(grid)
+            s.run()
+            v = SolverHungarian(grid, method="vectorized")
+            v.run()
+            self.assertEqual(v.pairs, s.pairs)
+        M = np.array([[0., 1., 0.], [0., 2., 3.], [4., 0., 0.]])
+        outlined, slashed = s.step1(M)
+        outlined_vectorized, slashed_vectorized = s.step1_vectorized(M)
+        self.assertEqual(list(outlined_vectorized.items()), list(outlined.items()))
+
+    def test_jv(self): # the shortest augmenting paths engine finds an optimal solution without the dense matrix
+        for s in self.assertSameScoreAsScipy(lambda grid: SolverHungarian(grid, method="jv")):
+            self.assertIsNone(s.matrice)
+        grid = Grid(1, 3, value=[[1, 5, 2]]) # more even cells than odd ones: (0, 0) is left alone through its dummy column
+        s = SolverHungarian(grid, method="jv")
+        s.run()
+        self.assertEqual(s.pairs, [((0, 2), (0, 1))])
+        with self.assertRaises(Exception):
+            SolverHungarian(grid, method="unknown")
+
+
+if __name__ == '__main__':
+    unittest.main()
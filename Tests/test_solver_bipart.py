@@ -45,7 +45,32 @@ class Test_SolverGreedy(unittest.TestCase):
             s.run()
         except Exception as e:
             self.fail(f"s.run() raised an exception: {e}")
-    
+
+    def test_residual_graph(self): # same pairs as rebuilding the extended graph at each augmentation
+        grid = Grid.grid_from_file("input/grid11.in",read_values=True)
+        s = SolverBipart(grid, method="augmenting_path")
+        s.run()
+        G = grid.all_pairs()
+        C = []
+        pa = s.augmenting_path(C, G)
+        while pa != []:
+            C = s.symmetric_difference(pa[1:-1], C)
+            pa = s.augmenting_path(C, G)
+        self.assertEqual(s.pairs, C)
+
+    def test_hopcroft_karp(self): # both engines give a maximum matching, so matchings of the same size
+        grid = Grid.grid_from_file("input/grid12.in",read_values=True)
+        hk = SolverBipart(grid)
+        hk.run()
+        ap = SolverBipart(grid, method="augmenting_path")
+        ap.run()
+        self.assertEqual(len(hk.pairs), len(ap.pairs))
+        cells = [cell for pair in hk.pairs for cell in pair]
+        self.assertEqual(len(cells), len(set(cells)))
+        self.assertTrue(all(grid.is_valid_pair(*c1, *c2) for (c1, c2) in hk.pairs))
+        with self.assertRaises(Exception):
+            SolverBipart(grid, method="unknown")
+
 
 if __name__ == '__main__':
     unittest.main()
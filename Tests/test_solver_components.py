@@ -0,0 +1,68 @@
+import sys 
+sys.path.append("code/")
+
+import unittest 
+from grid import Grid
+from solver import *
+from solver_test_case import SolverTestCase
+
+class Test_SolverComponents(SolverTestCase):
+    def test_components(self): # the components cover exactly the cells which belong to a pair
+        grid = Grid.grid_from_file("input/grid17.in",read_values=True)
+        s = SolverComponents(grid)
+        cells = sorted(c for component in s.components() for c in component.tolist())
+        paired = sorted({i * grid.m + j for pair in grid.all_pairs() for (i, j) in pair})
+        self.assertEqual(cells, paired)
+
+    def test_split(self):
+        color = [[0, 0, 4, 0], [4, 4, 4, 0], [4, 4, 0, 0]]
+        value = [[1, 2, 9, 3], [9, 9, 9, 4], [9, 9, 5, 6]]
+        grid = Grid(3, 4, color=color, value=value)
+        s = SolverComponents(grid, SolverHungarian, method="jv")
+        self.assertEqual([component.tolist() for component in s.components()], [[0, 1], [3, 7, 10, 11]]) # black cells left out
+        subgrid, i0, j0 = s.subgrid(s.components()[1]) # the columns 2 and 3
+        self.assertEqual((subgrid.n, subgrid.m, i0, j0), (3, 2, 0, 2))
+        self.assertEqual(subgrid.color_array.tolist(), [[4, 0], [4, 0], [0, 0]])
+        self.assertEqual(subgrid.value_array.tolist(), [[9, 3], [9, 4], [5, 6]])
+        s.run()
+        self.assertEqual(s.pairs, [((0, 0), (0, 1)), ((1, 3), (0, 3)), ((2, 2), (2, 3))]) # (even cell, odd cell) as given by the jv engine
+        self.assertEqual({type(x) for pair in s.pairs for cell in pair for x in cell}, {int})
+        scipy_solver = SolverScipy(grid)
+        scipy_solver.run()
+        self.assertEqual(s.score(), scipy_solver.score())
+
+    def test_single_pairs(self): # a component of two cells is its pair, the solver is not called
+        grid = Grid(2, 3, color=[[0, 0, 4], [4, 4, 4]], value=[[3, 5, 1], [1, 1, 1]])
+        s = SolverComponents(grid, solver=None)
+        s.run()
+        self.assertEqual(s.pairs, [((0, 0), (0, 1))])
+
+    def test_list_backed_grid(self): # the lists are converted once, not once per component
+        grid = Grid.grid_from_file("input/grid17.in",read_values=True)
+        reads = []
+        class CountingGrid(Grid):
+            @property
+            def color_array(self):
+                reads.append("color")
+                return super().color_array
+            @property
+            def value_array(self):
+                reads.append("value")
+                return super().value_array
+        counting = CountingGrid(grid.n, grid.m, grid.color, grid.value)
+        s = SolverComponents(counting, SolverScipy)
+        self.assertGreater(len(s.components()), 10)
+        reads.clear()
+        s.run()
+        self.assertLessEqual(len(reads), 2)
+        scipy_solver = SolverScipy(grid)
+        scipy_solver.run()
+        self.assertEqual(s.score(), scipy_solver.score())
+
+    def test_score(self): # same score as solving the whole grid at once, whatever the solver of the components
+        for solver, options in [(SolverScipy, {}), (SolverSparse, {}), (SolverHungarian, {"method": "jv"})]:
+            self.assertSameScoreAsScipy(lambda grid: SolverComponents(grid, solver, **options))
+
+
+if __name__ == '__main__':
+    unittest.main()
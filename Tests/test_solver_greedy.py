@@ -3,6 +3,7 @@ sys.path.append("code/")
 
 import unittest 
 from grid import Grid
+from generator import generate_grid
 from solver import *
 
 class Test_SolverGreedy(unittest.TestCase):
@@ -24,6 +25,20 @@ class Test_SolverGreedy(unittest.TestCase):
             s.run()
         except Exception as e:
             self.fail(f"s.run() raised an exception: {e}")
+
+    def test_same_pairs_as_loop(self): # the sorted pass gives the pairs of the former loop, in the same order
+        grids = [Grid.grid_from_file("input/grid05.in",read_values=True), Grid.grid_from_file("input/grid17.in",read_values=True), 
+                 generate_grid(12, 15, black_density=0.2, value_range=(1, 5), seed=3)]
+        for grid in grids:
+            s = SolverGreedy(grid)
+            s.run()
+            sol = []
+            G = grid.all_pairs()
+            while G: # the former run: take the least expensive pair, then remove the pairs sharing one of its cells
+                pair = G[s.index_min([grid.cost(pair) for pair in G])]
+                sol.append(pair)
+                G = s.remove(pair, G)
+            self.assertEqual(s.pairs, sol)
         
         
 
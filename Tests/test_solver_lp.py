@@ -0,0 +1,32 @@
+import sys 
+sys.path.append("code/")
+
+import unittest 
+from grid import Grid
+from solver import *
+from solver_test_case import SolverTestCase
+
+class Test_SolverLP(SolverTestCase):
+    def test_same_score_as_scipy(self):
+        self.assertSameScoreAsScipy(SolverLP)
+
+    def test_dual_bound(self): # the relaxation is exact on a bipartite graph, so the dual bound is reached
+        for s in self.assertSameScoreAsScipy(SolverLP, ["input/grid05.in", "input/grid17.in"]):
+            self.assertEqual(len(s.duals), s.grid.n * s.grid.m)
+            self.assertTrue((s.duals >= -1e-9).all()) # duals of the constraints "each cell in at most one pair"
+            u, v, _ = s.grid.edge_arrays()
+            value = s.grid.value_array.ravel()
+            self.assertTrue((s.duals[u] + s.duals[v] >= 2 * np.minimum(value[u], value[v]) - 1e-6).all()) # feasible
+            self.assertEqual(s.dual_bound(), s.score())
+
+    def test_constraints(self):
+        grid = Grid.grid_from_file("input/grid00.in",read_values=True)
+        A = SolverLP(grid).constraints()
+        u, v, _ = grid.edge_arrays()
+        self.assertEqual(A.shape, (grid.n * grid.m, len(u)))
+        self.assertEqual(A.sum(axis=0).tolist(), [[2] * len(u)]) # two cells per pair
+        self.assertEqual(A[grid.cell_id(0, 0)].toarray().sum(), 2) # the pairs ((0, 0), (1, 0)) and ((0, 0), (0, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,38 @@
+import sys 
+sys.path.append("code/")
+
+import unittest 
+from grid import Grid
+from solver import *
+from solver_test_case import SolverTestCase
+
+class Test_SolverMinCostFlow(SolverTestCase):
+    def test_same_score_as_scipy(self): # optimal solution, as the assignment solvers
+        self.assertSameScoreAsScipy(SolverMinCostFlow)
+
+    def test_network(self):
+        grid = Grid(1, 3, value=[[1, 5, 2]])
+        rows, sink, head, cost, capacity, first, arcs = SolverMinCostFlow(grid).network()
+        self.assertEqual((rows, sink), ([0, 2], 3))
+        # 0 -> 1, 2 -> 1, the even cells 0, 2 -> sink and the odd cell 1 -> sink, each followed by its reverse arc
+        self.assertEqual(head[0::2], [1, 1, 3, 3, 3])
+        self.assertEqual(cost[0::2], [-2, -4, 0, 0, 0])
+        self.assertEqual(capacity, [1, 0] * 5)
+        for x in range(sink + 1):
+            for e in arcs[first[x]:first[x + 1]]:
+                self.assertEqual(head[e ^ 1], x) # e leaves x, so its reverse arc goes to x
+                self.assertEqual(cost[e ^ 1], -cost[e])
+
+    def test_cells_left_alone(self):
+        grid = Grid(1, 3, value=[[1, 5, 2]])
+        s = SolverMinCostFlow(grid)
+        s.run()
+        self.assertEqual(s.pairs, [((0, 2), (0, 1))])
+        grid = Grid(2, 2, color=[[4, 4], [4, 4]]) # no pair at all
+        s = SolverMinCostFlow(grid)
+        s.run()
+        self.assertEqual(s.pairs, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
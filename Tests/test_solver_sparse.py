@@ -0,0 +1,34 @@
+import sys 
+sys.path.append("code/")
+
+import unittest 
+from grid import Grid
+from solver import *
+from solver_test_case import SolverTestCase
+
+class Test_SolverSparse(SolverTestCase):
+    def test_same_score_as_scipy(self):
+        self.assertSameScoreAsScipy(SolverSparse)
+
+    def test_dummy_columns(self): # K = 2 * 5 + 1 = 11, a pair weighs 11 - 2 * min and each row has its own dummy column of weight 11
+        grid = Grid(1, 3, value=[[1, 5, 2]])
+        s = SolverSparse(grid)
+        self.assertEqual((s.cases_paires.tolist(), s.cases_impaires.tolist()), ([0, 2], [1]))
+        self.assertEqual(s.matrice.toarray().tolist(), [[9, 11, 0], [7, 0, 11]])
+
+    def test_no_pair(self): # only black cells
+        grid = Grid(2, 2, color=[[4, 4], [4, 4]], value=[[1, 2], [3, 4]])
+        s = SolverSparse(grid)
+        s.run()
+        self.assertEqual((s.pairs, s.score()), ([], 0))
+
+    def test_odd_number_of_cells(self):
+        grid = Grid(1, 3, value=[[1, 5, 2]])
+        s = SolverSparse(grid)
+        s.run()
+        self.assertEqual(s.pairs, [((0, 2), (0, 1))]) # cost 3, the cell (0, 0) of value 1 stays alone
+        self.assertEqual(s.score(), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
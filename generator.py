@@ -0,0 +1,146 @@
+import argparse
+import gzip
+import lzma
+import numpy as np
+from grid import Grid, COLOR_DTYPE, VALUE_DTYPE
+"""
+This is the generator module. It creates reproducible random grids, as Grid objects or as files in the format of Grid.grid_from_file,
+to test the solvers on grids much larger than the ones of input/.
+"""
+
+GENERATOR_BAND_CELLS = 1 << 20 # Number of cells generated (and written) at once
+
+
+def _band_generators(seed):
+    """
+    Returns three independent random generators (black cells, colors, values) derived from seed.
+    Each one is only used for one kind of draws, so the grid does not depend on the size of the bands.
+    """
+    return [np.random.default_rng(s) for s in np.random.SeedSequence(seed).spawn(3)]
+
+
+def _band_rows(m: int) -> int:
+    """
+    Returns the number of rows generated at once for a grid with m columns
+    """
+    return max(1, GENERATOR_BAND_CELLS // max(1, m))
+
+
+def _color_bands(n, m, black_density, color_weights, seed):
+    """
+    Generator over the colors of the grid, by bands of rows
+    """
+    p = np.asarray(color_weights, dtype=float)
+    if p.shape != (4,) or np.any(p < 0) or p.sum() <= 0:
+        raise ValueError("color_weights must be 4 non-negative weights for white, red, blue and green, not all zero")
+    p = p / p.sum()
+    rng_black, rng_color, _ = _band_generators(seed)
+    band_rows = _band_rows(m)
+    for first_row in range(0, n, band_rows):
+        rows = min(band_rows, n - first_row)
+        color = rng_color.choice(4, size=(rows, m), p=p).astype(COLOR_DTYPE)
+        color[rng_black.random((rows, m)) < black_density] = 4
+        yield color
+
+
+def _value_bands(n, m, value_range, seed):
+    """
+    Generator over the values of the grid, by bands of rows
+    """
+    low, high = value_range
+    if low > high:
+        raise ValueError("value_range must be (low, high) with low <= high")
+    limits = np.iinfo(VALUE_DTYPE)
+    if low < limits.min or high > limits.max: # the cast to VALUE_DTYPE would wrap around
+        raise ValueError(f"value_range must be within {limits.min}..{limits.max} (VALUE_DTYPE)")
+    _, _, rng_value = _band_generators(seed)
+    band_rows = _band_rows(m)
+    for first_row in range(0, n, band_rows):
+        rows = min(band_rows, n - first_row)
+        yield rng_value.integers(low, high, size=(rows, m), endpoint=True).astype(VALUE_DTYPE)
+
+
+def generate_grid(n, m, black_density=0.0, color_weights=(1, 1, 1, 1), value_range=(1, 10), seed=None) -> Grid:
+    """
+    Creates a random array-backed grid.
+
+    Parameters:
+    -----------
+    n: int
+        Number of lines in the grid
+    m: int
+        Number of columns in the grid
+    black_density: float
+        Probability for each cell to be black
+    color_weights: tuple[float]
+        Relative frequencies of white, red, blue and green among the cells that are not black
+    value_range: tuple[int]
+        The values are drawn uniformly in low..high (both included)
+    seed: int
+        Seed of the random generators. The same parameters and seed always give the same grid,
+        which is also the grid written by write_grid_file
+
+    Output:
+    -------
+    grid: Grid
+        The grid
+    """
+    color = np.empty((n, m), dtype=COLOR_DTYPE)
+    value = np.empty((n, m), dtype=VALUE_DTYPE)
+    first_row = 0
+    for band in _color_bands(n, m, black_density, color_weights, seed):
+        color[first_row:first_row + band.shape[0]] = band
+        first_row += band.shape[0]
+    first_row = 0
+    for band in _value_bands(n, m, value_range, seed):
+        value[first_row:first_row + band.shape[0]] = band
+        first_row += band.shape[0]
+    return Grid(n, m, color, value)
+
+
+def _format_band(band: np.ndarray) -> bytes:
+    """
+    Returns the lines of text of a band of integers, in the format of Grid.grid_from_file
+    """
+    if band.size and band.min() >= 0 and band.max() <= 9:
+        # One digit per integer: the text is built directly as bytes, "d d d ... d\n" for each row
+        text = np.full((band.shape[0], 2 * band.shape[1]), ord(" "), dtype=np.uint8)
+        text[:, 0::2] = band + ord("0")
+        text[:, -1] = ord("\n")
+        return text.tobytes()
+    return "".join(" ".join(map(str, row)) + "\n" for row in band.tolist()).encode()
+
+
+def write_grid_file(file_name, n, m, black_density=0.0, color_weights=(1, 1, 1, 1), value_range=(1, 10), seed=None):
+    """
+    Writes a random grid in the text format of Grid.grid_from_file (with the values), without ever holding the whole grid
+    or the whole text in memory: the grid is generated and written by bands of rows.
+    The file is compressed if its name ends with .gz or .xz.
+    The parameters are the ones of generate_grid, and Grid.grid_from_file(file_name, read_values=True) gives the grid of generate_grid.
+    """
+    if file_name.endswith(".gz"):
+        file = gzip.open(file_name, "wb")
+    elif file_name.endswith(".xz"):
+        file = lzma.open(file_name, "wb")
+    else:
+        file = open(file_name, "wb")
+    with file:
+        file.write(f"{n} {m}\n".encode())
+        for band in _color_bands(n, m, black_density, color_weights, seed):
+            file.write(_format_band(band))
+        for band in _value_bands(n, m, value_range, seed):
+            file.write(_format_band(band))
+
+
+if __name__ == "__main__":
+    # e.g. python generator.py input/grid_5000x5000.in 5000 5000 --black 0.5 --values 1 9 --seed 0
+    parser = argparse.ArgumentParser(description="Writes a random grid file")
+    parser.add_argument("file_name")
+    parser.add_argument("n", type=int)
+    parser.add_argument("m", type=int)
+    parser.add_argument("--black", type=float, default=0.0, help="probability for a cell to be black")
+    parser.add_argument("--colors", type=float, nargs=4, default=(1, 1, 1, 1), help="weights of white, red, blue and green")
+    parser.add_argument("--values", type=int, nargs=2, default=(1, 10), help="smallest and largest value")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+    write_grid_file(args.file_name, args.n, args.m, args.black, args.colors, args.values, args.seed)
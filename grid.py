@@ -1,9 +1,63 @@
 from matplotlib.colors import ListedColormap
 import matplotlib.pyplot as plt
 import numpy as np
+import gzip
+import hashlib
+import lzma
+import os
+import struct
+import sys
+from itertools import chain, islice
 """
 This is the grid module. It contains the Grid class and its associated methods.
 """
+
+COLOR_DTYPE = np.uint8 # Colors are in range(5) so one byte per cell is enough
+VALUE_DTYPE = np.int32 # Signed so that differences of values do not wrap around
+
+# COMPATIBLE_COLORS[c1, c2] is True if a cell of color c1 can be paired with a cell of color c2
+COMPATIBLE_COLORS = np.zeros((5, 5), dtype=bool)
+COMPATIBLE_COLORS[0, :4] = True # If white all pair color valid except black
+COMPATIBLE_COLORS[:4, 0] = True
+COMPATIBLE_COLORS[1:3, 1:3] = True # red with red, red with blue and blue with blue
+COMPATIBLE_COLORS[3, 3] = True # Green with green
+_COMPATIBLE_COLORS_LIST = COMPATIBLE_COLORS.tolist() # Nested lists are faster than an ndarray for a single lookup
+
+# Binary grid files (.bin): a BINARY_HEADER_SIZE bytes header "magic, n, m, color dtype, value dtype", 
+# then the n*m colors and, at the next multiple of 8, the n*m values, both in row-major order
+BINARY_MAGIC = b"GRIDBIN1"
+BINARY_HEADER = struct.Struct("<8sQQ8s8s")
+BINARY_HEADER_SIZE = 64
+
+EDGE_BAND_CELLS = 1 << 16 # Default number of cells in the bands of Grid.iter_edges
+BLOCK_CHUNK_LINES = 1024 # Number of lines of a text grid file parsed at once
+GZIP_MAGIC = b"\x1f\x8b"
+XZ_MAGIC = b"\xfd7zXZ\x00"
+
+
+def open_grid_file(file_name):
+    """
+    Opens a grid text file for reading. Files compressed with gzip or xz are detected from their first bytes 
+    (whatever their extension) and are decompressed as a stream while being read.
+    """
+    with open(file_name, "rb") as file:
+        magic = file.read(len(XZ_MAGIC))
+    if magic.startswith(GZIP_MAGIC):
+        return gzip.open(file_name, "rt")
+    if magic.startswith(XZ_MAGIC):
+        return lzma.open(file_name, "rt")
+    return open(file_name, "r")
+
+
+def _sorted_unique(a: np.ndarray) -> np.ndarray:
+    """
+    Returns the sorted distinct elements of an integer array, like np.unique but with a sort, 
+    which is much faster than the hash table of np.unique on large arrays
+    """
+    a = np.sort(a)
+    return a[np.concatenate(([True], a[1:] != a[:-1]))] if a.size else a
+
+
 class Grid():
     
     """
@@ -15,18 +69,25 @@ class Grid():
         Number of lines in the grid
     m: int
         Number of columns in the grid
-    color: list[list[int]]
+    color: list[list[int]] or ndarray
         The color of each grid cell: value[i][j] is the value in the cell (i, j), i.e., in the i-th line and j-th column. 
         Note: lines are numbered 0..n-1 and columns are numbered 0..m-1.
-    value: list[list[int]]
+        When the grid is array-backed, this is a contiguous (n, m) ndarray of dtype COLOR_DTYPE.
+    value: list[list[int]] or ndarray
         The value of each grid cell: value[i][j] is the value in the cell (i, j), i.e., in the i-th line and j-th column. 
         Note: lines are numbered 0..n-1 and columns are numbered 0..m-1.
+        When the grid is array-backed, this is a contiguous (n, m) ndarray of dtype VALUE_DTYPE.
     colors_list: list[char]
         The mapping between the value of self.color[i][j] and the corresponding color
+
+    The data derived from color and value (edge_arrays, adjacency, fingerprint, and total_value when the grid is array-backed) 
+    is cached. A cell must therefore be modified with set_color and set_value, or by reassigning color or value: 
+    after an in-place edit such as grid.value[i][j] = x, invalidate_cache() must be called by hand. 
+    The scores only read the current values of a list-backed grid, as its lists are converted again at each call.
     """
     
 
-    def __init__(self, n, m, color=[], value=[]):
+    def __init__(self, n, m, color=[], value=[], as_array=False):
         """
         Initializes the grid.
 
@@ -40,18 +101,127 @@ class Grid():
             The grid cells colors. Default is empty (then the grid is created with each cell having color 0, i.e., white).
         value: list[list[int]]
             The grid cells values. Default is empty (then the grid is created with each cell having value 1).
+        as_array: bool
+            If True, color and value are stored as contiguous integer ndarrays instead of nested lists. 
+            Indexing with color[i][j] keeps working in both cases. Default is False.
         
         The object created has an attribute colors_list: list[char], which is the mapping between the value of self.color[i][j] and the corresponding color
         """
         self.n = n
         self.m = m
-        if not color:
+        self._cache = {} # Data derived from color and value (edges, adjacency...), emptied when they change
+        if len(color) == 0:
             color = [[0 for j in range(m)] for i in range(n)]            
         self.color = color
-        if not value:
+        if len(value) == 0:
             value = [[1 for j in range(m)] for i in range(n)]            
         self.value = value
         self.colors_list = ['w', 'r', 'b', 'g', 'k']
+        if as_array or isinstance(color, np.ndarray) or isinstance(value, np.ndarray):
+            self.as_arrays()
+
+    def is_array_backed(self) -> bool:
+        """
+        Returns True if color and value are stored as ndarrays and False if they are nested lists
+        """
+        return isinstance(self.color, np.ndarray) and isinstance(self.value, np.ndarray)
+
+    def as_arrays(self):
+        """
+        Converts in place the storage of color and value to contiguous ndarrays of dtype COLOR_DTYPE and VALUE_DTYPE.
+        Does nothing (no copy) if the grid is already array-backed with these dtypes.
+
+        Output: 
+        -------
+        grid: Grid
+            The grid itself, to allow chaining such as Grid.grid_from_file(...).as_arrays()
+        """
+        self.color = np.ascontiguousarray(self.color, dtype=COLOR_DTYPE).reshape(self.n, self.m)
+        self.value = np.ascontiguousarray(self.value, dtype=VALUE_DTYPE).reshape(self.n, self.m)
+        return self
+
+    def as_lists(self):
+        """
+        Converts in place the storage of color and value back to nested lists of int.
+
+        Output: 
+        -------
+        grid: Grid
+            The grid itself
+        """
+        if isinstance(self.color, np.ndarray):
+            self.color = self.color.tolist()
+        if isinstance(self.value, np.ndarray):
+            self.value = self.value.tolist()
+        return self
+
+    @property
+    def color(self):
+        return self._color
+
+    @color.setter
+    def color(self, color):
+        if color is not getattr(self, "_color", None):
+            self._color = color
+            self.invalidate_cache()
+
+    @property
+    def value(self):
+        return self._value
+
+    @value.setter
+    def value(self, value):
+        if value is not getattr(self, "_value", None):
+            self._value = value
+            self.invalidate_cache()
+
+    def invalidate_cache(self):
+        """
+        Forgets everything computed from color and value (edges, adjacency...). 
+        It is called automatically when color or value is reassigned or changed with set_color and set_value, 
+        but it must be called by hand after modifying in place a cell, e.g. grid.color[i][j] = c (see the class docstring).
+        """
+        self._cache.clear()
+
+    def set_color(self, i: int, j: int, color: int):
+        """
+        Sets the color of the cell (i, j) and invalidates the cached data of the grid
+        """
+        self.color[i][j] = color
+        self.invalidate_cache()
+
+    def set_value(self, i: int, j: int, value: int):
+        """
+        Sets the value of the cell (i, j) and invalidates the cached data of the grid
+        """
+        self.value[i][j] = value
+        self.invalidate_cache()
+
+    def _cached(self, key: str, compute):
+        """
+        Returns self._cache[key], computing it with compute() if it is not in the cache
+        """
+        if key not in self._cache:
+            self._cache[key] = compute()
+        return self._cache[key]
+
+    @property
+    def color_array(self) -> np.ndarray:
+        """
+        The colors as a (n, m) ndarray of dtype COLOR_DTYPE. 
+        No copy is made when the grid is array-backed. The lists of a list-backed grid are converted at each call 
+        (not cached, so that in-place edits of the lists are seen), solvers should keep the array instead of calling it in a loop.
+        """
+        return np.asarray(self.color, dtype=COLOR_DTYPE).reshape(self.n, self.m)
+
+    @property
+    def value_array(self) -> np.ndarray:
+        """
+        The values as a (n, m) ndarray of dtype VALUE_DTYPE. 
+        No copy is made when the grid is array-backed. The lists of a list-backed grid are converted at each call 
+        (not cached, so that in-place edits of the lists are seen), solvers should keep the array instead of calling it in a loop.
+        """
+        return np.asarray(self.value, dtype=VALUE_DTYPE).reshape(self.n, self.m)
 
     def __str__(self): 
         """
@@ -62,7 +232,7 @@ class Grid():
             output += f"{[self.colors_list[self.color[i][j]] for j in range(self.m)]}\n"
         output += f"and the following values:\n"
         for i in range(self.n): 
-            output += f"{self.value[i]}\n"
+            output += f"{[int(v) for v in self.value[i]]}\n"
         return output
 
     def __repr__(self): 
@@ -80,8 +250,7 @@ class Grid():
         plt.imshow(grid, cmap=cmap, extent=[0, self.m, 0, self.n], origin='upper')
         plt.xticks(np.arange(0, self.m + 1, 1)) 
         plt.yticks(np.arange(0, self.n + 1, 1)) 
-        v=self.value.copy() 
-        v.reverse()# issue because matrix is numerated from top to bottom but a grid is from bottom to top
+        v=self.value[::-1] # issue because matrix is numerated from top to bottom but a grid is from bottom to top
         def border_of_cell(x,y): #To mark the border of each cell
             rect = plt.Rectangle((x-.5, y-.5), 1,1, fill=False, color = "black", lw=1)
             ax = plt.gca()
@@ -114,7 +283,7 @@ class Grid():
         """
         Returns True is the cell (i, j) is black and False otherwise
         """
-        return self.color[i][j] == 4
+        return bool(self.color[i][j] == 4)
 
     def cost(self, pair : tuple[tuple[int]]) -> int:
         """
@@ -130,20 +299,268 @@ class Grid():
         cost: int
             the cost of the pair defined as the absolute value of the difference between their values
         """
-        return abs(self.value[pair[0][0]][pair[0][1]] - self.value[pair[1][0]][pair[1][1]])
+        return abs(int(self.value[pair[0][0]][pair[0][1]]) - int(self.value[pair[1][0]][pair[1][1]]))
 
     def is_valid_pair(self, i1 : int,j1 : int, i2: int, j2: int) -> bool:
-        valid = (0 <= i1 < self.n) and (0 <= j1 < self.m) and (0 <= i2 < self.n) and (0 <= j2 < self.m) and (i1 != i2 or j1 != j2) # All coordinate are valid
-        valid = valid and (not self.is_forbidden(i1, j1)) and (not self.is_forbidden(i2, j2)) # Both cells are not black
-        valid = valid and (abs(i1 - i2) + abs(j1 - j2) == 1) # The cells are adjacent
-        #We check the validity of the colors
-        valid = valid and (self.color[i1][j1] == 0 or self.color[i2][j2] == 0 or # If white all pair color valid except black
-                           (self.color[i1][j1] == 1 and self.color[i2][j2] == 1) or # red with red
-                           (self.color[i1][j1] == 2 and self.color[i2][j2] == 1)  or (self.color[i1][j1]==1 and self.color[i2][j2]==2)  or # red with blue
-                           (self.color[i1][j1] == 2 and self.color[i2][j2] == 2) or # Blue with Blue 
-                           (self.color[i1][j1] == 3 and self.color[i2][j2] == 3) # Green with green
-                           )
-        return valid
+        """
+        Returns True if the cells (i1, j1) and (i2, j2) can be taken together, i.e. they are in the grid, adjacent 
+        and their colors are compatible (see COMPATIBLE_COLORS), and False otherwise
+        """
+        if not ((0 <= i1 < self.n) and (0 <= j1 < self.m) and (0 <= i2 < self.n) and (0 <= j2 < self.m)): # All coordinate are valid
+            return False
+        if abs(i1 - i2) + abs(j1 - j2) != 1: # The cells are adjacent (and so distinct)
+            return False
+        return _COMPATIBLE_COLORS_LIST[self.color[i1][j1]][self.color[i2][j2]] # One lookup checks both black cells and colors
+
+    def are_valid_pairs(self, i1: np.ndarray, j1: np.ndarray, i2: np.ndarray, j2: np.ndarray) -> np.ndarray:
+        """
+        Array version of is_valid_pair: the four arguments are integer arrays of the same shape and the output is 
+        the boolean array of is_valid_pair(i1[k], j1[k], i2[k], j2[k]) for every k
+        """
+        i1, j1, i2, j2 = np.asarray(i1), np.asarray(j1), np.asarray(i2), np.asarray(j2)
+        valid = (0 <= i1) & (i1 < self.n) & (0 <= j1) & (j1 < self.m) & (0 <= i2) & (i2 < self.n) & (0 <= j2) & (j2 < self.m)
+        valid &= (np.abs(i1 - i2) + np.abs(j1 - j2) == 1)
+        color = self.color_array
+        # Out of the grid coordinates are replaced by 0 before the lookup, they are already rejected by valid
+        c1 = color[np.where(valid, i1, 0), np.where(valid, j1, 0)]
+        c2 = color[np.where(valid, i2, 0), np.where(valid, j2, 0)]
+        return valid & self.compatible_colors(c1, c2)
+
+    def compatible_colors(self, c1, c2):
+        """
+        Returns True where a cell of color c1 can be paired with a cell of color c2. 
+        c1 and c2 can be ints or integer arrays of the same shape, in which case the lookup is done for all of them at once
+        """
+        return COMPATIBLE_COLORS[c1, c2]
+
+    def edge_arrays(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Returns all the valid pairs of the grid as three parallel integer arrays (u, v, weight).
+
+        The cells are encoded by their flat index i*m + j. The edges are computed with masks over shifted views of the grid
+        (each cell against the cell below and the cell on its right) and are given in the same order as all_pairs: 
+        cells in row-major order, and for each cell the vertical pair before the horizontal one.
+
+        Output: 
+        -------
+        u: ndarray
+            Flat index of the first cell of each pair (the top or left cell)
+        v: ndarray
+            Flat index of the second cell of each pair (the bottom or right cell)
+        weight: ndarray
+            Cost of each pair, i.e. the absolute value of the difference between the values of its cells
+
+        The arrays are cached (see invalidate_cache) and read-only, they must be copied before being modified.
+        """
+        return self._cached("edge_arrays", self._compute_edge_arrays)
+
+    def _compute_edge_arrays(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Computes the output of edge_arrays
+        """
+        u, v, weight = self.band_edges(0, self.n)
+        for array in (u, v, weight):
+            array.flags.writeable = False
+        return u, v, weight
+
+    def band_edges(self, first_row: int, last_row: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Returns the valid pairs whose first cell is in the rows first_row..last_row-1, as the arrays (u, v, weight) of edge_arrays. 
+        Only the rows first_row..last_row (the last one for the vertical pairs) of the grid are read.
+        """
+        m = self.m
+        rows = last_row - first_row
+        # Only the rows of the band are converted when the grid is list-backed
+        color = np.asarray(self.color[first_row:last_row + 1], dtype=COLOR_DTYPE).reshape(-1, m)
+        value = np.asarray(self.value[first_row:last_row + 1], dtype=VALUE_DTYPE).reshape(-1, m)
+        # mask[i, j, 0] is the pair ((i, j), (i+1, j)) and mask[i, j, 1] the pair ((i, j), (i, j+1)), i being relative to first_row
+        mask = np.zeros((rows, m, 2), dtype=bool)
+        below = color.shape[0] - 1 # number of rows of the band that have a row below them
+        mask[:below, :, 0] = self.compatible_colors(color[:below, :], color[1:, :])
+        mask[:, :-1, 1] = self.compatible_colors(color[:rows, :-1], color[:rows, 1:])
+        k = np.flatnonzero(mask)
+        u = k >> 1
+        v = u + np.where(k & 1, 1, m)
+        flat_value = value.ravel()
+        weight = np.abs(flat_value[u] - flat_value[v])
+        offset = first_row * m
+        return u + offset, v + offset, weight
+
+    def iter_edges(self, band_rows=None):
+        """
+        Generator over the valid pairs of the grid, by bands of band_rows rows. 
+        Each band is given as the arrays (u, v, weight) of edge_arrays, and the bands are in the order of edge_arrays. 
+        Unlike edge_arrays nothing is kept in memory, so a single pass over the pairs of a very large grid 
+        (e.g. memory-mapped with Grid.grid_from_binary) only needs the memory of one band.
+
+        Parameters: 
+        -----------
+        band_rows: int
+            Number of rows in each band. Default is the number of rows that makes bands of about EDGE_BAND_CELLS cells
+        """
+        if band_rows is None:
+            band_rows = max(1, EDGE_BAND_CELLS // max(1, self.m))
+        for first_row in range(0, self.n, band_rows):
+            yield self.band_edges(first_row, min(first_row + band_rows, self.n))
+
+    def adjacency(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Returns the graph of the valid pairs in compressed sparse row (CSR) format over the flat cell indices i*m + j: 
+        the neighbours of the cell k are indices[indptr[k]:indptr[k+1]] (in increasing order) 
+        and the costs of the corresponding pairs are weights[indptr[k]:indptr[k+1]].
+
+        The adjacency is built in O(E) from edge_arrays the first time it is needed, then cached (see invalidate_cache). 
+        The arrays are read-only.
+
+        Output: 
+        -------
+        indptr: ndarray
+            Array of size n*m + 1
+        indices: ndarray
+            Array of size 2E (each pair appears in the rows of its two cells)
+        weights: ndarray
+            Array of size 2E
+        """
+        return self._cached("adjacency", self._compute_adjacency)
+
+    def _compute_adjacency(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Computes the output of adjacency
+        """
+        u, v, weight = self.edge_arrays()
+        source = np.concatenate((u, v))
+        target = np.concatenate((v, u))
+        order = np.lexsort((target, source)) # sorted by cell, then by neighbour
+        indices = target[order]
+        weights = np.concatenate((weight, weight))[order]
+        indptr = np.zeros(self.n * self.m + 1, dtype=np.int64)
+        np.cumsum(np.bincount(source, minlength=self.n * self.m), out=indptr[1:])
+        for array in (indptr, indices, weights):
+            array.flags.writeable = False
+        return indptr, indices, weights
+
+    def total_value(self) -> int:
+        """
+        Returns the sum of the values of the cells that are not black, i.e. the score when no pair is taken 
+        (cached when the grid is array-backed, recomputed from the lists otherwise)
+        """
+        compute = lambda: int(self.value_array[self.color_array != 4].sum(dtype=np.int64))
+        if not self.is_array_backed():
+            return compute()
+        return self._cached("total_value", compute)
+
+    def score(self, pairs) -> int:
+        """
+        Returns the score of a list (or set) of pairs: the sum of the costs of the pairs plus the sum of the values 
+        of the cells that are neither black nor in a pair.
+
+        It starts from total_value() and only looks at the cells of the pairs, so it costs O(len(pairs)) array operations.
+        """
+        if len(pairs) == 0:
+            return self.total_value()
+        u, v = self.pairs_to_ids(pairs)
+        value = self.value_array.ravel()
+        color = self.color_array.ravel()
+        cost = np.abs(value[u].astype(np.int64) - value[v]).sum()
+        used = np.unique(np.concatenate((u, v))) # a cell in several pairs is only removed once
+        used = used[color[used] != 4]
+        return int(self.total_value() + cost - value[used].sum(dtype=np.int64))
+
+    def batch_score(self, solution, u, v, k=None, used=None, validate=False) -> np.ndarray:
+        """
+        Returns the scores of k candidate solutions at once, in a few vectorized operations over all their pairs
+        (instead of k calls to score).
+
+        The pairs of all the candidates are given together: the p-th pair is (u[p], v[p]) (flat indices, see cell_id)
+        and belongs to the candidate solution[p]. solutions_to_ids builds these arrays from lists of pairs.
+
+        Parameters:
+        -----------
+        solution: np.ndarray
+            Integer array, the candidate (0..k-1) of each pair
+        u, v: np.ndarray
+            Integer arrays, the flat indices of the two cells of each pair
+        k: int
+            Number of candidates (by default len(used) if used is given, solution.max() + 1 otherwise). 
+            A candidate with no pair has the score total_value(). Raises an Exception if solution.max() >= k
+        used: np.ndarray
+            Optional boolean matrix of shape (k, n*m), used[s, c] being True if the cell c is in a pair of the candidate s.
+            When it is given, the values of the cells in pairs are summed with a matrix product instead of being
+            gathered from u and v
+        validate: bool
+            If True, checks that all the pairs are valid, that no cell is in two pairs of the same candidate
+            and that used matches the pairs. Raises an Exception otherwise
+
+        Output:
+        -------
+        scores: np.ndarray
+            Integer array of length k, scores[s] being score(pairs of the candidate s)
+        """
+        solution, u, v = np.asarray(solution, dtype=np.int64), np.asarray(u, dtype=np.int64), np.asarray(v, dtype=np.int64)
+        nm = self.n * self.m
+        if used is not None:
+            used = np.asarray(used, dtype=bool)
+            if k is None:
+                k = len(used) # the candidates without pairs at the end only appear in used
+            if used.shape != (k, nm):
+                raise Exception(f"used must have the shape {(k, nm)}, not {used.shape}")
+        if k is None:
+            k = int(solution.max()) + 1 if solution.size else 0
+        if solution.size and (solution.min() < 0 or solution.max() >= k):
+            raise Exception("The candidates must be numbered from 0 to k-1")
+        value = self.value_array.ravel().astype(np.int64)
+        value[self.color_array.ravel() == 4] = 0 # black cells are not counted in the score
+        cells = np.concatenate((u, v))
+        owners = np.concatenate((solution, solution))
+        if validate:
+            if cells.size and (cells.min() < 0 or cells.max() >= nm):
+                raise Exception("Cell index out of the grid")
+            i1, j1 = self.cell_of(u)
+            i2, j2 = self.cell_of(v)
+            if not self.are_valid_pairs(i1, j1, i2, j2).all():
+                raise Exception("Invalid pair in the candidate solutions")
+            if _sorted_unique(owners * nm + cells).size != cells.size:
+                raise Exception("A cell is in two pairs of the same candidate solution")
+            if used is not None:
+                if not used[owners, cells].all() or used.sum() != cells.size:
+                    raise Exception("used does not match the pairs of the candidate solutions")
+        cost = np.bincount(solution, weights=np.abs(value[u] - value[v]), minlength=k)
+        if used is None:
+            # Each (candidate, cell) is only removed once, as in score
+            keys = _sorted_unique(owners * nm + cells)
+            removed = np.bincount(keys // nm, weights=value[keys % nm], minlength=k)
+        else:
+            removed = used @ value
+        return self.total_value() + cost.astype(np.int64) - removed.astype(np.int64)
+
+    def solutions_to_ids(self, solutions: list) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Converts a list of k solutions (each one a list of pairs ((i1, j1), (i2, j2))) to the arrays (solution, u, v)
+        of batch_score, e.g. grid.batch_score(*grid.solutions_to_ids(solutions), k=len(solutions))
+        """
+        sizes = [len(pairs) for pairs in solutions]
+        u, v = self.pairs_to_ids(list(chain.from_iterable(solutions)))
+        return np.repeat(np.arange(len(solutions)), sizes), u, v
+
+    def fingerprint(self) -> str:
+        """
+        Returns a hash (hexadecimal string) of the content of the grid: n, m, the colors and the values. 
+        Two grids with the same content have the same fingerprint whatever their storage (lists, arrays, memory map...), 
+        so it can be used as a key to cache solutions or to find duplicate grids, e.g. 
+        Grid.grid_from_file(file_name, read_values=True).fingerprint() == grid.fingerprint().
+        The fingerprint is cached until the grid is modified (see invalidate_cache).
+        """
+        return self._cached("fingerprint", self._compute_fingerprint)
+
+    def _compute_fingerprint(self) -> str:
+        """
+        Computes the output of fingerprint, hashing the raw buffers of the colors (uint8) and of the values (little-endian int64)
+        """
+        h = hashlib.blake2b(digest_size=16)
+        h.update(struct.pack("<QQ", self.n, self.m))
+        h.update(np.ascontiguousarray(self.color_array, dtype=np.uint8).data)
+        h.update(np.ascontiguousarray(self.value_array, dtype="<i8").data)
+        return h.hexdigest()
 
     def all_pairs(self) -> list:
         """
@@ -151,22 +568,43 @@ class Grid():
 
         Outputs a list of tuples of tuples [(c1, c2), (c1', c2'), ...] where each cell c1 etc. is itself a tuple (i, j)
         """
-        pairs = []
-        for i in range(self.n):
-            for j in range(self.m): 
-                if self.is_valid_pair(i, j, i+1, j): # True if both cells are not black
-                    pairs.append(((i, j), (i+1, j)))
-                    
-                if self.is_valid_pair(i, j, i, j+1): # Same as above
-                    pairs.append(((i, j), (i, j+1)))
-                    
-        return pairs
+        u, v, _ = self.edge_arrays()
+        return self.ids_to_pairs(u, v)
+
+    def cell_id(self, i, j):
+        """
+        Returns the flat index i*m + j of the cell (i, j). i and j can be ints or integer arrays
+        """
+        return i * self.m + j
+
+    def cell_of(self, k):
+        """
+        Returns the cell (i, j) of flat index k, i.e. (k // m, k % m). k can be an int or an integer array
+        """
+        return divmod(k, self.m)
+
+    def pairs_to_ids(self, pairs: list) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Converts a list of pairs [((i1, j1), (i2, j2)), ...] to two arrays (u, v) of flat indices, 
+        u[k] and v[k] being the flat indices of the first and second cell of the k-th pair
+        """
+        cells = np.fromiter(chain.from_iterable(chain.from_iterable(pairs)), dtype=np.int64, count=4 * len(pairs)).reshape(-1, 4)
+        return self.cell_id(cells[:, 0], cells[:, 1]), self.cell_id(cells[:, 2], cells[:, 3])
+
+    def ids_to_pairs(self, u, v) -> list:
+        """
+        Converts two sequences (u, v) of flat indices back to the list of pairs [((i1, j1), (i2, j2)), ...]
+        """
+        m = self.m
+        u = u.tolist() if isinstance(u, np.ndarray) else u
+        v = v.tolist() if isinstance(v, np.ndarray) else v
+        return [((a // m, a % m), (b // m, b % m)) for a, b in zip(u, v)]
     
 
 
 
     @classmethod
-    def grid_from_file(cls, file_name, read_values=False): 
+    def grid_from_file(cls, file_name, read_values=False, as_array=False): 
         """
         Creates a grid object from class Grid, initialized with the information from the file file_name.
         
@@ -177,35 +615,312 @@ class Grid():
             - first line contains "n m" 
             - next n lines contain m integers that represent the colors of the corresponding cell
             - next n lines [optional] contain m integers that represent the values of the corresponding cell
+            The file can be compressed with gzip or xz (e.g. grid21.in.gz or grid21.in.xz), it is then decompressed on the fly
         read_values: bool
             Indicates whether to read values after having read the colors. Requires that the file has 2n+1 lines
+        as_array: bool
+            Indicates whether the grid should store color and value as ndarrays (see Grid.as_arrays)
 
         Output: 
         -------
         grid: Grid
             The grid
         """
-        with open(file_name, "r") as file:
+        with open_grid_file(file_name) as file:
             n, m = map(int, file.readline().split())
-            color = [[] for i_line in range(n)]
-            for i_line in range(n):
-                line_color = list(map(int, file.readline().split()))
-                if len(line_color) != m: 
-                    raise Exception("Format incorrect")
-                for j in range(m):
-                    if line_color[j] not in range(5):
-                        raise Exception("Invalid color")
-                color[i_line] = line_color
+            # Line numbers start at 1 with the line "n m", so the colors are on lines 2..n+1 and the values on lines n+2..2n+1
+            color = cls.read_block(file, n, m, 2, COLOR_DTYPE, check_colors=True)
 
             if read_values:
-                value = [[] for i_line in range(n)]
-                for i_line in range(n):
-                    line_value = list(map(int, file.readline().split()))
-                    if len(line_value) != m: 
-                        raise Exception("Format incorrect")
-                    value[i_line] = line_value
+                value = cls.read_block(file, n, m, n + 2, VALUE_DTYPE)
             else:
                 value = []
 
-            grid = Grid(n, m, color, value)
+            if not as_array: # the default storage stays nested lists
+                color = color.tolist()
+                if read_values:
+                    value = value.tolist()
+            grid = Grid(n, m, color, value, as_array=as_array)
         return grid
+
+    @classmethod
+    def read_block(cls, file, n: int, m: int, first_line: int, dtype, check_colors=False, chunk_lines=BLOCK_CHUNK_LINES) -> np.ndarray:
+        """
+        Reads the next n lines of m integers of an open text file, chunk_lines lines at a time, 
+        so that only one chunk of the file is held as a string at any time.
+
+        Parameters: 
+        -----------
+        file: text file
+            The file, positioned at the beginning of the block
+        n: int
+            Number of lines of the block
+        m: int
+            Number of integers on each line
+        first_line: int
+            Number of the first line of the block in the file, used in the error messages
+        dtype: numpy dtype
+            The dtype of the output array
+        check_colors: bool
+            If True, raises an Exception if an integer is not in range(5)
+        chunk_lines: int
+            Number of lines parsed at once with Grid.parse_block
+
+        Output: 
+        -------
+        block: ndarray
+            The (n, m) array of the integers of the block
+        """
+        block = np.empty((n, m), dtype=dtype)
+        for start in range(0, n, chunk_lines):
+            rows = min(chunk_lines, n - start)
+            chunk = cls.parse_block(list(islice(file, rows)), rows, m, first_line + start)
+            if check_colors:
+                invalid = (chunk < 0) | (chunk > 4)
+                if invalid.any():
+                    k = int(np.argmax(invalid))
+                    raise Exception(f"Invalid color on line {first_line + start + k // m}: {chunk.flat[k]} is not in range(5)")
+            limits = np.iinfo(dtype)
+            if chunk.size and (chunk.min() < limits.min or chunk.max() > limits.max): # the cast to dtype would wrap around
+                k = int(np.argmax((chunk < limits.min) | (chunk > limits.max)))
+                raise Exception(f"Format incorrect on line {first_line + start + k // m}: {chunk.flat[k]} does not fit in {np.dtype(dtype).name}")
+            block[start:start + rows] = chunk
+        return block
+
+    @staticmethod
+    def parse_block(lines: list[str], n: int, m: int, first_line: int) -> np.ndarray:
+        """
+        Parses a block of n lines of m integers separated by whitespaces in one pass over the bytes of the block.
+
+        Parameters: 
+        -----------
+        lines: list[str]
+            The lines of the block, as read from the file (with or without their trailing newline)
+        n: int
+            Number of lines expected in the block
+        m: int
+            Number of integers expected on each line
+        first_line: int
+            Number of the first line of the block in the file, used in the error messages
+
+        Output: 
+        -------
+        block: ndarray
+            The (n, m) int64 array of the integers of the block
+
+        The integers can have a sign '-' or '+', as with int(). Raises an Exception giving the number of the first 
+        incorrect line if a line is missing, if a line does not contain exactly m integers or if it contains something else than integers.
+        """
+        if len(lines) < n:
+            raise Exception(f"Format incorrect on line {first_line + len(lines)}: expected {n} lines, found {len(lines)}")
+        text = "".join(lines)
+        if not text.endswith("\n"):
+            text += "\n"
+        b = np.frombuffer(text.encode(), dtype=np.uint8)
+        newline_pos = np.flatnonzero(b == 10) # the k-th line of the block ends at newline_pos[k]
+        is_digit = (b >= 48) & (b <= 57) # between '0' and '9'
+        is_minus = b == 45
+        is_sign = is_minus | (b == 43) # '-' or '+', as accepted by int()
+        is_space = (b == 32) | (b == 9) | (b == 13) | (b == 10)
+        prev_digit = np.concatenate(([False], is_digit[:-1]))
+        next_digit = np.concatenate((is_digit[1:], [False]))
+        prev_space = np.concatenate(([True], is_space[:-1]))
+        prev_minus = np.concatenate(([False], is_minus[:-1]))
+        prev_sign = np.concatenate(([False], is_sign[:-1]))
+        # A '-' or '+' is only allowed as the sign of an integer, and an integer can only start after a whitespace or a sign
+        starts = is_digit & ~prev_digit
+        wrong = ~(is_digit | is_space | is_sign) | (is_sign & ~(next_digit & prev_space)) | (starts & ~(prev_space | prev_sign))
+        if wrong.any():
+            k = int(np.argmax(wrong))
+            line = first_line + int(np.searchsorted(newline_pos, k))
+            raise Exception(f"Format incorrect on line {line}: unexpected character {chr(b[k])!r}")
+
+        start_pos = np.flatnonzero(starts)
+        widths = np.diff(np.searchsorted(start_pos, newline_pos), prepend=0) # number of integers on each line
+        wrong_lines = np.flatnonzero(widths != m)
+        if wrong_lines.size:
+            i = int(wrong_lines[0])
+            raise Exception(f"Format incorrect on line {first_line + i}: expected {m} integers, found {widths[i]}")
+        if n * m == 0:
+            return np.zeros((n, m), dtype=np.int64)
+
+        digit_pos = np.flatnonzero(is_digit)
+        if digit_pos.size == start_pos.size: # Only one digit per integer, which is always the case for the colors
+            block = b[digit_pos].astype(np.int64) - 48
+        else:
+            # Each integer is the sum of its digits times 10 to the power of their distance to its last digit
+            first_digit = starts[digit_pos]
+            token_of_digit = np.cumsum(first_digit) - 1
+            end_pos = np.flatnonzero(is_digit & ~next_digit)
+            too_long = end_pos - start_pos >= 18 # more than 18 digits could wrap around in int64
+            if too_long.any():
+                k = int(start_pos[np.argmax(too_long)])
+                raise Exception(f"Format incorrect on line {first_line + int(np.searchsorted(newline_pos, k))}: integer too large")
+            place = end_pos[token_of_digit] - digit_pos
+            digits = (b[digit_pos].astype(np.int64) - 48) * np.power(10, place, dtype=np.int64)
+            block = np.add.reduceat(digits, np.flatnonzero(first_digit))
+        block[prev_minus[start_pos]] *= -1
+        return block.reshape(n, m)
+
+    def save_binary(self, file_name):
+        """
+        Saves the grid in the binary format read by Grid.grid_from_binary.
+
+        Parameters: 
+        -----------
+        file_name: str
+            Name of the file to write, by convention with the extension .bin
+        """
+        color = self.color_array
+        value = self.value_array
+        color_end = BINARY_HEADER_SIZE + color.nbytes
+        padding = -color_end % 8 # The values start at a multiple of 8 so that they are aligned in memory
+        with open(file_name, "wb") as file:
+            file.write(BINARY_HEADER.pack(BINARY_MAGIC, self.n, self.m, color.dtype.str.encode(), value.dtype.str.encode()).ljust(BINARY_HEADER_SIZE, b"\0"))
+            file.write(color.tobytes())
+            file.write(b"\0" * padding)
+            file.write(value.tobytes())
+
+    @classmethod
+    def grid_from_binary(cls, file_name, mode="c"):
+        """
+        Creates an array-backed grid from a file written by Grid.save_binary. 
+        The color and value planes are memory-mapped, so nothing is read or copied before the cells are used.
+
+        Parameters: 
+        -----------
+        file_name: str
+            Name of the binary file to load
+        mode: str
+            The numpy.memmap mode: "c" (default) gives copy-on-write arrays that can be modified without changing the file, 
+            "r" gives read-only arrays and "r+" writes the modifications back to the file
+
+        Output: 
+        -------
+        grid: Grid
+            The grid
+        """
+        with open(file_name, "rb") as file:
+            header = file.read(BINARY_HEADER_SIZE)
+        if len(header) < BINARY_HEADER_SIZE or header[:len(BINARY_MAGIC)] != BINARY_MAGIC:
+            raise Exception(f"Format incorrect: {file_name} is not a binary grid file")
+        _, n, m, color_dtype, value_dtype = BINARY_HEADER.unpack(header[:BINARY_HEADER.size])
+        color_dtype = np.dtype(color_dtype.rstrip(b"\0").decode())
+        value_dtype = np.dtype(value_dtype.rstrip(b"\0").decode())
+        color_end = BINARY_HEADER_SIZE + n * m * color_dtype.itemsize
+        if n * m == 0:
+            return Grid(n, m, np.zeros((n, m), dtype=color_dtype), np.zeros((n, m), dtype=value_dtype))
+        color = np.memmap(file_name, dtype=color_dtype, mode=mode, offset=BINARY_HEADER_SIZE, shape=(n, m))
+        value = np.memmap(file_name, dtype=value_dtype, mode=mode, offset=color_end + (-color_end % 8), shape=(n, m))
+        return Grid(n, m, color, value)
+
+    @staticmethod
+    def convert_to_binary(file_name, binary_file_name=None, read_values=True):
+        """
+        Converts a text grid file (see Grid.grid_from_file) to the binary format of Grid.save_binary.
+
+        Parameters: 
+        -----------
+        file_name: str
+            Name of the text file to convert
+        binary_file_name: str
+            Name of the binary file to write. Default is file_name with the extension replaced by .bin
+        read_values: bool
+            Indicates whether the text file contains the values (see Grid.grid_from_file)
+
+        Output: 
+        -------
+        binary_file_name: str
+            Name of the binary file written
+        """
+        if binary_file_name is None:
+            binary_file_name = os.path.splitext(file_name)[0] + ".bin"
+        Grid.grid_from_file(file_name, read_values=read_values, as_array=True).save_binary(binary_file_name)
+        return binary_file_name
+
+
+
+class ScoreTracker():
+    """
+    The score of a set of pairs of a grid, updated in O(1) each time a pair is added or removed.
+
+    The score starts at the sum of the values of the cells that are not black (no pair). Adding a pair ((i1, j1), (i2, j2)) 
+    subtracts the two values and adds the cost of the pair, removing it does the opposite. The pairs are expected to be 
+    valid and disjoint, as in a game (see Grid.score for the score of any list of pairs).
+
+    The tracker can be used as the set of its pairs (add, remove, clear, in, len, iteration), 
+    so that it can replace a set of pairs without changing the code that fills it.
+
+    Attributes: 
+    -----------
+    grid: Grid
+        The grid
+    score: int
+        The score of the pairs
+    pairs: set[tuple[tuple[int]]]
+        The pairs, each being a tuple ((i1, j1), (i2, j2))
+    """
+
+    def __init__(self, grid, pairs=()):
+        """
+        Initializes the tracker with the pairs given (none by default).
+        """
+        self.reset(grid)
+        for pair in pairs:
+            self.add_pair(pair)
+
+    def reset(self, grid=None):
+        """
+        Removes all the pairs. If a grid is given, the tracker now follows this grid.
+        """
+        if grid is not None:
+            self.grid = grid
+        self.pairs = set()
+        self.score = self.grid.total_value()
+
+    def _gain(self, pair) -> int:
+        """
+        Returns the change of the score when the pair is added: its cost minus the values of its two cells
+        """
+        (i1, j1), (i2, j2) = pair
+        v1 = int(self.grid.value[i1][j1])
+        v2 = int(self.grid.value[i2][j2])
+        return abs(v1 - v2) - v1 - v2
+
+    def add_pair(self, pair):
+        """
+        Adds a pair ((i1, j1), (i2, j2)) and updates the score. Adding a pair already there does nothing.
+        """
+        if pair not in self.pairs:
+            self.pairs.add(pair)
+            self.score += self._gain(pair)
+
+    def remove_pair(self, pair):
+        """
+        Removes a pair ((i1, j1), (i2, j2)) and updates the score. Raises a KeyError if the pair is not there.
+        """
+        self.pairs.remove(pair)
+        self.score -= self._gain(pair)
+
+    def add(self, pair):
+        self.add_pair(pair)
+
+    def remove(self, pair):
+        self.remove_pair(pair)
+
+    def clear(self):
+        self.reset()
+
+    def __contains__(self, pair) -> bool:
+        return pair in self.pairs
+
+    def __iter__(self):
+        return iter(self.pairs)
+
+    def __len__(self) -> int:
+        return len(self.pairs)
+
+if __name__ == "__main__":
+    # python grid.py input/grid21.in input/grid22.in ... writes input/grid21.bin, input/grid22.bin ...
+    for file_name in sys.argv[1:]:
+        print(Grid.convert_to_binary(file_name))
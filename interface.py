@@ -1,10 +1,11 @@
 import pygame
 import tkinter as tk
 from tkinter import messagebox
-from grid import Grid 
-from solver_version_finale import SolverScipy, SolverEmpty, Solver
+from grid import Grid, ScoreTracker
+from solver_version_finale import SolverSparse, SolverEmpty, Solver
 import math
-from copy import deepcopy
+import os
+import numpy as np
 from typing import Union
 
 
@@ -24,9 +25,11 @@ class PygameGame():
     grid : Grid
         A grid object representing the game board check the documentation of the grid class for more details, 
         it is initialized with a 3x4 grid to handle feature necessary before choosing a grid but this grid is not used in the game
-    solver : SolverScipy
+    solver : SolverSparse
         Solver object for computing solutions to the grid game check the documentation of the solver class for more details,
-        by default it used the scipy linear sum assignment solver to function because it is the more efficient 
+        by default it uses the sparse minimum weight matching solver because it is the more efficient (also on large grids)
+    solvers : dict
+        The solvers of the grids already opened, with the fingerprint of their grid (see Grid.fingerprint) as key
     cell_size : int
         Size of each cell in pixels by default it is set at 100 but this value is dynamically changed to match the size of the window
     width : int
@@ -47,8 +50,8 @@ class PygameGame():
         Font for cell numbers
     clicked_cells : list of tuple
         Currently selected cells for linking
-    linked_cells : set of tuple of tuple
-        Pairs of all the cells that are currenly connected in the game
+    linked_cells : ScoreTracker
+        Pairs of all the cells that are currenly connected in the game, used as a set that also keeps their score up to date
     used_cells : set of tuple
         All cells that are currently used in connections
     time_start_event : float
@@ -98,7 +101,8 @@ class PygameGame():
         Also sets up data structures to track clicked cells, linked cells and game state.
         """
         self.grid = Grid(3,4)
-        self.solver = SolverScipy(self.grid)
+        self.solver = SolverSparse(self.grid)
+        self.solvers = {} # The solver of each grid already opened, the key is the fingerprint of the grid
         self.cell_size = 100
         self.width = self.grid.m * self.cell_size
         self.height = self.grid.n * self.cell_size
@@ -113,7 +117,8 @@ class PygameGame():
         self.text_font = pygame.font.SysFont('Arial', 30) #We differentiate the font for texte and cell/coordinate 
         self.cell_font = pygame.font.SysFont('Arial', 30)
         self.clicked_cells = []  # Store the two first clicked cells to check if they are valid pairs
-        self.linked_cells = set()  # Store all linked cells
+        self.linked_cells = ScoreTracker(self.grid)  # Store all linked cells and their score
+        self.score_trackers = [self.linked_cells] # All the ScoreTracker to move to a new grid when the grid changes
         self.used_cells = set() # Store all used cells
         self.time_start_event = None # Store the time when the print event starts
         self.text_event = None # Store the text to print
@@ -310,8 +315,8 @@ class PygameGame():
 
         Parameters
         ----------
-        pairs : list of tuple
-            The list of pairs that make up the current solution.
+        pairs : list of tuple or ScoreTracker
+            The list of pairs that make up the current solution. The score of a ScoreTracker is read directly.
 
         Returns
         -------
@@ -319,23 +324,9 @@ class PygameGame():
             The total score for the given list of pairs.
         """
 
-        score = 0
-        color_grid = deepcopy(self.grid.color)
-        
-        for pair in pairs:
-            # We add to the score the cost of each pair
-            score += self.grid.cost(pair) 
-            # Each cell already counted is colored in black
-            color_grid[pair[0][0]][pair[0][1]] = 4 
-            color_grid[pair[1][0]][pair[1][1]] = 4
-        
-        for i in range(self.grid.n): 
-            for j in range(self.grid.m):
-                if color_grid[i][j] != 4:
-                    score += self.grid.value[i][j]
-                     # We add the individual value of each cell that is not black/already counted
-        
-        return score
+        if isinstance(pairs, ScoreTracker): # The score is already known
+            return pairs.score
+        return self.grid.score(pairs)
     
 
     def quit_game_button(self):
@@ -383,8 +374,18 @@ class PygameGame():
             The index of the grid to load (e.g., "00", "01", etc.).
         """
 
-        self.grid = Grid.grid_from_file("./input/grid"+grid_index+".in", read_values=True)
-        self.solver = SolverScipy(self.grid)
+        binary_file_name = "./input/grid"+grid_index+".bin"
+        if os.path.exists(binary_file_name): # Binary grids (see Grid.convert_to_binary) are memory-mapped instead of parsed
+            self.grid = Grid.grid_from_binary(binary_file_name)
+        else:
+            self.grid = Grid.grid_from_file("./input/grid"+grid_index+".in", read_values=True, as_array=True)
+        fingerprint = self.grid.fingerprint()
+        if fingerprint not in self.solvers: # A grid opened again keeps its solver and the solution already computed
+            self.solvers[fingerprint] = SolverSparse(self.grid)
+        self.solver = self.solvers[fingerprint]
+        self.grid = self.solver.grid # Keeps the data already cached on the grid (edges, adjacency...)
+        for tracker in self.score_trackers:
+            tracker.reset(self.grid)
         self.grid_menu = False
         self.adjust_for_resize()
         self.clicked_cells.clear()
@@ -407,8 +408,8 @@ class PygameGame():
             self.clicked_cells.clear()
             self.linked_cells.clear()
             self.used_cells.clear()
-            self.solver.pairs=list(self.linked_cells)
-            self.solver.run()
+            if not self.solver.pairs: # The solution is only computed the first time it is shown
+                self.solver.run()
             for ((i1, j1), (i2, j2)) in self.solver.pairs:
                 self.used_cells.add((i1, j1))
                 self.used_cells.add((i2, j2))
@@ -449,18 +450,12 @@ class PygameGame():
             True if the game is finished, False otherwise.
         """
 
-        finished = True
-        for i in range(self.grid.n):
-            for j in range(self.grid.m):
-                if self.grid.color[i][j] != 4 and (i, j) not in self.used_cells:
-                    if i-1>0 and (i-1,j) not in self.used_cells and self.grid.is_valid_pair(i, j, i-1, j):
-                        finished = False
-                    if j-1>0 and (i,j-1) not in self.used_cells and self.grid.is_valid_pair(i, j, i, j-1):
-                        finished = False
-                    if i+1<self.grid.n and (i+1,j) not in self.used_cells and self.grid.is_valid_pair(i, j, i+1, j):
-                        finished = False
-                    if j+1<self.grid.m and (i,j+1) not in self.used_cells and self.grid.is_valid_pair(i, j, i, j+1):
-                        finished = False
+        # The game is finished when no valid pair has both its cells unused
+        u, v, _ = self.grid.edge_arrays()
+        free = np.ones(self.grid.n * self.grid.m, dtype=bool)
+        for (i, j) in self.used_cells:
+            free[i * self.grid.m + j] = False
+        finished = not np.any(free[u] & free[v])
         return finished
      
 
@@ -643,8 +638,9 @@ class PygameTwoPlayerGame(PygameGame):
     def __init__(self):
         super().__init__()
         self.wich_turn = 0 # 0 for player 0 and 1 for player 1
-        self.player0_pairs = set()
-        self.player1_pairs = set()
+        self.player0_pairs = ScoreTracker(self.grid)
+        self.player1_pairs = ScoreTracker(self.grid)
+        self.score_trackers += [self.player0_pairs, self.player1_pairs]
         self.players_pairs = [self.player0_pairs, self.player1_pairs] # List of pairs for each player
     
     def reset_grid(self):
@@ -823,10 +819,10 @@ class PygamePlayerVsPlayerGame(PygameTwoPlayerGame):
             else: #If we display a grid
                 self.draw_all()
                 if self.is_finished():
-                    if self.score(self.player0_pairs) < self.score(self.player1_pairs):
+                    if self.player0_pairs.score < self.player1_pairs.score:
                         self.time_start_event = pygame.time.get_ticks()
                         self.end_current_game(self.players_pairs[0], text_to_print=f"Player {0} wins with a score of {self.score(self.players_pairs[0])}")
-                    elif self.score(self.player0_pairs) == self.score(self.player1_pairs):
+                    elif self.player0_pairs.score == self.player1_pairs.score:
                         self.time_start_event = pygame.time.get_ticks()
                         self.end_current_game(self.players_pairs[0], text_to_print=f"Egalité des joueurs avec un score de {self.score(self.players_pairs[0])}")
                     else:
@@ -1,10 +1,12 @@
 from grid import Grid
-from copy import deepcopy 
 import matplotlib.pyplot as plt
 import numpy as np
 from math import inf
-from scipy.optimize import linear_sum_assignment
+from scipy.optimize import linear_sum_assignment, linprog
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import connected_components, min_weight_full_bipartite_matching
 from collections import deque
+from heapq import heappush, heappop
 
 
 
@@ -34,25 +36,26 @@ class Solver:
 
     def score(self) -> int: # We want to minimize the score
         """
-        Computes of the list of pairs in self.pairs
+        Computes of the list of pairs in self.pairs (see Grid.score)
         """
-        score = 0
-        color_grid = deepcopy(self.grid.color)
-        
-        for pair in self.pairs:
-            # We add to the score the cost of each pair
-            score += self.grid.cost(pair) 
-            # Each cell already counted is colored in black
-            color_grid[pair[0][0]][pair[0][1]] = 4 
-            color_grid[pair[1][0]][pair[1][1]] = 4
-        
-        for i in range(self.grid.n): 
-            for j in range(self.grid.m):
-                if color_grid[i][j] != 4:
-                    score += self.grid.value[i][j]
-                     # We add the individual value of each cell that is not black/already counted
-        
-        return score
+        return self.grid.score(self.pairs)
+
+    def lower_bound(self) -> int:
+        """
+        Returns a lower bound of the score of any solution, computed in a single pass over the pairs of the grid (see Grid.iter_edges).
+
+        Taking a pair (c1, c2) lowers the score by 2*min(value(c1), value(c2)) <= best(c1) + best(c2), 
+        where best(c) is the largest min(value(c), value(c')) over the pairs (c, c'). 
+        Each cell is in at most one pair, so no solution scores less than the sum of the values minus the sum of the best(c).
+        """
+        value = self.grid.value_array.ravel()
+        best = np.zeros(value.size, dtype=np.int64)
+        for (u, v, _) in self.grid.iter_edges():
+            gain = np.minimum(value[u], value[v])
+            np.maximum.at(best, u, gain)
+            np.maximum.at(best, v, gain)
+        not_black = self.grid.color_array.ravel() != 4
+        return int(value[not_black].sum(dtype=np.int64) - best.sum())
      
 
 class SolverEmpty(Solver):
@@ -84,13 +87,14 @@ class SolverGreedy(Solver):
     Methods
     -------
     remove(pair : tuple, p : list) -> list
-        Removes the specified pair from the list `p`.
+        Removes the specified pair from the list `p`. Legacy helper of the former O(E^2) loop, no longer used by `run`.
     
     index_min(l : list) -> int
-        Returns the index of the minimum element in the list `l`.
+        Returns the index of the minimum element in the list `l`. Legacy helper of the former O(E^2) loop, no longer used by `run`.
     
     run() -> None
-        Solves the assignment problem using the greedy algorithm by iteratively selecting the least expensive pair.
+        Solves the assignment problem using the greedy algorithm by iteratively selecting the least expensive pair, 
+        in a single pass over the pairs sorted by cost.
     """
     def remove(self, pair : tuple, p : list) -> list: # removes the element pair in the list p 
         """
@@ -142,26 +146,22 @@ class SolverGreedy(Solver):
         """
         Solves the grid using the greedy method: at each step, the least expensive pair is chosen.
 
-        This method iteratively finds and removes the least costly pair from the list of all pairs.
+        Choosing the least expensive remaining pair (the first one in the order of all_pairs in case of a tie) at each step 
+        is the same as going once through the pairs sorted by cost with a stable sort, and taking each pair whose two cells 
+        are still free. The complexity is O(E log E) for E pairs instead of O(E^2), for the same pairs.
         """
-        sol = []
-        G = self.grid.all_pairs()
-        d = {}
-        for i in range(self.grid.n):
-            for j in range(self.grid.m):
-                d[(i,j)] = False
-                 
-        # Iterative version
-        while G:
-            l = [self.grid.cost(pair) for pair in G]
-            ind = self.index_min(l) # get index of minimum cost
-            pair = G[ind]           # get pair with minimum cost
-            d[pair[0]] = True
-            d[pair[1]] = True
-            sol.append(pair)
-            G = self.remove(pair, G) # remove pair and its connected edges
+        # The cells are handled as flat indices i*m + j, they are converted back to tuples at the end
+        u, v, weight = self.grid.edge_arrays()
+        order = np.argsort(weight, kind="stable") # stable: ties are kept in the order of all_pairs
+        used = bytearray(self.grid.n * self.grid.m)
+        sol_u, sol_v = [], []
+        for a, b in zip(u[order].tolist(), v[order].tolist()):
+            if not used[a] and not used[b]:
+                used[a] = used[b] = 1
+                sol_u.append(a)
+                sol_v.append(b)
             
-        self.pairs = sol
+        self.pairs = self.grid.ids_to_pairs(sol_u, sol_v)
 
     
 
@@ -211,23 +211,52 @@ class SolverBipart(Solver):
     symmetric_difference(path : list, C : list) -> list
         Returns the symmetric difference between the path and the current matching `C`.
     
+    residual_augmenting_paths() -> tuple
+        Returns the matching of the augmenting path method, computed on a residual graph updated in place.
+    
+    hopcroft_karp() -> tuple
+        Returns a maximum matching computed with the Hopcroft-Karp algorithm.
+    
     run() -> None
-        Solves the bipartite matching problem by iteratively finding augmenting paths and updating the matching.
+        Solves the bipartite matching problem with the engine chosen by `method`.
     """
+    methods = ("hopcroft_karp", "augmenting_path") # engines available for run
+
+    def __init__(self, grid, method="hopcroft_karp"):
+        """
+        Initializes the solver.
+
+        Parameters: 
+        -----------
+        grid: Grid
+            The grid
+        method: str
+            "hopcroft_karp" (default): all the shortest augmenting paths are found together, in O(E * sqrt(V)).
+            "augmenting_path": one augmenting path at a time in the extended graph, as described in the methods above 
+            (computed with residual_augmenting_paths).
+            Both give a maximum matching, but not necessarily the same one.
+        """
+        if method not in self.methods:
+            raise Exception(f"Unknown method {method}, the methods are {self.methods}")
+        super().__init__(grid)
+        self.method = method
+
     def is_even(self, pair : tuple) -> bool: # returns True if pair[0] + pair[1] is even or, otherwise, returns False 
         """
         Returns True if pair[0] + pair[1] is even, otherwise returns False.
 
         Parameters
         ----------
-        pair : tuple
-            A tuple of two integers.
+        pair : tuple or int
+            A tuple of two integers, or the flat index i*m + j of the cell (i, j).
 
         Returns
         -------
         bool
             True if the sum of pair elements is even, False otherwise.
         """
+        if not isinstance(pair, tuple):
+            pair = divmod(pair, self.grid.m)
         return (  (pair[0] + pair[1]) %2  == 0 )
     
     def adjacency_dictionary(self, p : list) -> dict: # Builds the adjacency dictionary of p
@@ -244,18 +273,14 @@ class SolverBipart(Solver):
         dict
             A dictionary where keys are pairs and values are lists of adjacent pairs.
         """
-        # d[(i,j)] = list of neighbours of the cell (i,j)
+        # d[(i,j)] = list of neighbours of the cell (i,j) (the cells can also be given by their flat indices)
         d = {}
         for (p1,p2) in p: 
-            i1, j1 = p1[0], p1[1]
-            i2, j2 = p2[0], p2[1]
-            d[(i1,j1)] = []
-            d[(i2,j2)] = []
+            d[p1] = []
+            d[p2] = []
         for (p1,p2) in p: 
-            i1, j1 = p1[0], p1[1]
-            i2, j2 = p2[0], p2[1]
-            d[(i1,j1)].append((i2,j2))
-            d[(i2,j2)].append((i1,j1))
+            d[p1].append(p2)
+            d[p2].append(p1)
         return d 
     
     def is_free(self, vertex : tuple, dC : dict) -> bool: # returns True if the vertex is out of C or, otherwise, returns False
@@ -295,9 +320,9 @@ class SolverBipart(Solver):
         dC = self.adjacency_dictionary(C)
         s, p = -inf, inf
         dgc = {} 
-        for i in range(self.grid.n):
-             for j in range(self.grid.m):
-                  dgc[(i,j)] = [] #initialisation
+        for (vertex1, vertex2) in G:
+            dgc[vertex1] = [] #initialisation, the vertices are cells (i, j) or their flat indices
+            dgc[vertex2] = []
         dgc[s] = []
         dgc[p] = []
         for (vertex1, vertex2) in G: 
@@ -459,24 +484,166 @@ class SolverBipart(Solver):
         return nC
 
 
+    def residual_augmenting_paths(self) -> tuple[list, list]: # the augmenting path method without rebuilding the extended graph
+        """
+        Returns the matching built by the augmenting path method (augmenting_path and symmetric_difference until there is 
+        no augmenting path), with the same pairs in the same order, without rebuilding the extended graph at each step.
+
+        The extended graph only depends on the matching: s -> free even cells, even cell -> its odd neighbours, 
+        matched odd cell -> its mate, free odd cell -> p. It is kept implicitly as an adjacency in CSR format, 
+        built once with the neighbours in the order of the extended graph (the order of the pairs), 
+        and an array mate updated in place along each augmenting path. Each augmentation then costs one BFS, stopped at the first free odd cell, 
+        which is the end of the path exists_path would return.
+
+        Returns
+        -------
+        tuple
+            Two lists (u, v): the pairs of the matching are (u[k], v[k]), u[k] being the even cell, as flat indices.
+        """
+        u, v, _ = self.grid.edge_arrays()
+        cells = np.column_stack((u, v)).ravel() # the cells of the pairs, in the order in which extended_graph sees them
+        # Neighbours of each cell in the order of the pairs (unlike Grid.adjacency, sorted by cell index)
+        order = np.argsort(cells, kind="stable")
+        indices = np.column_stack((v, u)).ravel()[order].tolist()
+        indptr = np.zeros(self.grid.n * self.grid.m + 1, dtype=np.int64)
+        np.cumsum(np.bincount(cells, minlength=self.grid.n * self.grid.m), out=indptr[1:])
+        indptr = indptr.tolist()
+        mate = [-1] * (self.grid.n * self.grid.m) # mate[c] is the cell paired with c, -1 if c is free
+        # The free even cells in the order of the list of s in extended_graph, i.e. of their first appearance in the pairs
+        _, first = np.unique(cells, return_index=True)
+        free_even = dict.fromkeys(c for c in cells[np.sort(first)].tolist() if self.is_even(c))
+        # symmetric_difference puts the new pairs of a path first, in the order of the path, then the pairs kept: 
+        # the final order is given by (-number of the augmentation, position in its path)
+        rank = {}
+        step = 0
+        while free_even:
+            # BFS from s, stopped when a free odd cell leaves the queue
+            parent = dict.fromkeys(free_even)
+            queue = deque(free_even)
+            end = None
+            while queue:
+                a = queue.popleft()
+                if self.is_even(a):
+                    for b in indices[indptr[a]:indptr[a + 1]]:
+                        if b not in parent:
+                            parent[b] = a
+                            queue.append(b)
+                elif mate[a] == -1:
+                    end = a
+                    break
+                elif mate[a] not in parent:
+                    parent[mate[a]] = a
+                    queue.append(mate[a])
+            if end is None: # no augmenting path
+                break
+            # Augments along the path, from its end: each odd cell b is paired with the even cell a before it
+            path = []
+            b = end
+            while b is not None:
+                a = parent[b]
+                path.append(a)
+                b_next = mate[a] if mate[a] != -1 else None
+                mate[a], mate[b] = b, a
+                b = b_next
+            del free_even[path[-1]]
+            step += 1
+            for position, a in enumerate(reversed(path)):
+                rank[a] = (-step, position)
+
+        even = sorted(rank, key=rank.get)
+        return even, [mate[a] for a in even]
+
+    def hopcroft_karp(self) -> tuple[list, list]: # returns a maximum matching found with the Hopcroft-Karp algorithm
+        """
+        Returns a maximum matching of the graph of the valid pairs, computed with the Hopcroft-Karp algorithm 
+        on the flat cell indices and the CSR adjacency of the grid (see Grid.adjacency).
+
+        Each phase computes with a BFS from the free even cells the length of the shortest augmenting paths, 
+        then augments the matching along a maximal set of vertex-disjoint augmenting paths of this length with DFS. 
+        There are O(sqrt(V)) phases of O(E) each.
+
+        Returns
+        -------
+        tuple
+            Two lists (u, v): the pairs of the matching are (u[k], v[k]), as flat indices in the orientation of all_pairs.
+        """
+        indptr, indices, _ = self.grid.adjacency()
+        m = self.grid.m
+        degree = np.diff(indptr).reshape(self.grid.n, m)
+        i, j = np.indices((self.grid.n, m))
+        even = np.flatnonzero(((i + j) % 2 == 0) & (degree > 0)).tolist() # left side of the bipartite graph
+        indptr, indices = indptr.tolist(), indices.tolist()
+        mate = [-1] * (self.grid.n * m) # mate[c] is the cell paired with c, -1 if c is free
+        no_layer = len(mate) + 1
+
+        while True:
+            # BFS: layer[a] is the length of the shortest alternating path from a free even cell to the even cell a
+            layer = dict.fromkeys(even, no_layer)
+            queue = [a for a in even if mate[a] == -1]
+            for a in queue:
+                layer[a] = 0
+            shortest = no_layer # layer of the even cells from which a free odd cell can be reached
+            for a in queue: # the queue grows during the loop
+                if layer[a] >= shortest:
+                    break
+                for b in indices[indptr[a]:indptr[a + 1]]:
+                    c = mate[b]
+                    if c == -1:
+                        shortest = layer[a] + 1
+                    elif layer[c] == no_layer:
+                        layer[c] = layer[a] + 1
+                        queue.append(c)
+            if shortest == no_layer: # no augmenting path: the matching is maximum
+                break
+
+            # DFS along the layers from each free even cell. next_edge[a] is the next neighbour of a to try, 
+            # so each edge is looked at once per phase and the paths found are vertex-disjoint
+            next_edge = indptr[:]
+            for root in [a for a in even if mate[a] == -1]:
+                stack = [root]
+                while stack:
+                    a = stack[-1]
+                    while next_edge[a] < indptr[a + 1]:
+                        b = indices[next_edge[a]]
+                        next_edge[a] += 1
+                        c = mate[b]
+                        if c == -1 and layer[a] + 1 == shortest: # augmenting path found: root -> ... -> a -> b
+                            for a in stack: # the edge (a, b) followed from a is the one before next_edge[a]
+                                b = indices[next_edge[a] - 1]
+                                mate[a], mate[b] = b, a
+                                layer[a] = no_layer # the cells of the path are not used again in this phase
+                            stack = []
+                            break
+                        if c != -1 and layer[c] == layer[a] + 1:
+                            stack.append(c)
+                            break
+                    else: # dead end, a is not tried again in this phase
+                        layer[a] = no_layer
+                        stack.pop()
+
+        u, v = [], []
+        for a in even:
+            if mate[a] != -1:
+                u.append(min(a, mate[a]))
+                v.append(max(a, mate[a]))
+        return u, v
+
     def run(self): # Solves the grid using the maximum matching problem approach
         """
-        Solves the grid using the maximum matching problem approach.
+        Solves the grid using the maximum matching problem approach, with the engine self.method.
 
-        This method iteratively finds augmenting paths and updates the current matching until no more augmenting paths are found.
+        With "augmenting_path", this method iteratively finds augmenting paths and updates the current matching 
+        until no more augmenting paths are found.
         """
-        G = self.grid.all_pairs()
-        C = []
-        pa = self.augmenting_path(C,G)
-        while pa != [] : # Stops when self.augmenting_path(C,G) is None ie no more paths have been found in the extended graph
-            ch = (pa)[1:-1] # If a path exists in the extended graph, we use "[1:-1]" to remove the source and the sink from the actual path in G
-            C = self.symmetric_difference(ch, C)
-            pa =  self.augmenting_path(C,G)  # then the new matching consists of elements which were in the previous matching but not in the path, or elements which were in the path but not in the previous matching. According to the extended graph definition, the cardinality of the new matching is higher than that of the previous one.  
-        self.pairs = C
+        if self.method == "hopcroft_karp":
+            self.pairs = self.grid.ids_to_pairs(*self.hopcroft_karp())
+        else:
+            self.pairs = self.grid.ids_to_pairs(*self.residual_augmenting_paths())
             
-class SolverHungarian(Solver):
+class SolverAssignment(Solver):
     """
-    A solver class implementing the Hungarian algorithm for solving the assignment problem.
+    A base class for the solvers of the assignment problem between the even cells (rows) and the odd cells (columns), 
+    SolverHungarian and SolverScipy: it builds the cost matrix and turns an assignment back into pairs.
 
     Attributes
     ----------
@@ -488,22 +655,37 @@ class SolverHungarian(Solver):
         List of coordinates for the even cells (i + j) % 2 == 0.
     cases_impaires : list of tuple
         List of coordinates for the odd cells (i + j) % 2 == 1.
+    indices : ndarray
+        indices[i*m + j] is the index of the cell (i, j) in cases_paires if it is even, in cases_impaires if it is odd.
     paires : list of tuple
         All pairs of cells in the grid.
     matrice : ndarray
-        The matrix representing the cost of matching even and odd cells.
+        The matrix representing the cost of matching even and odd cells, of shape (len(cases_paires), len(cases_impaires)). 
+        It is rectangular when there are more even cells than odd ones: the rows left unassigned are the cells left alone.
+    compact : bool
+        If True, the matrices are stored in the narrowest integer dtype that holds their entries, otherwise in float64. 
+        Only SolverHungarian offers it: its engines work on a copy of the same dtype.
     """
 
-    def __init__(self, grid: Grid):
+    def __init__(self, grid: Grid, compact=False, dense=True):
         """
-        Initializes the solver using the Hungarian algorithm.
+        Initializes the solver with the cost matrix of the assignment problem.
 
         Parameters
         ----------
         grid : Grid
             The grid object containing the value and color data.
+        compact : bool
+            If True, the cost matrix is stored in the narrowest integer dtype that holds its entries 
+            (e.g. int8 instead of float64 when the values are below 32). This only shrinks the matrix at rest 
+            and the working copies of the Hungarian engines: a solver which converts the matrix to float64 
+            (such as linear_sum_assignment) would use more memory at its peak, not less. Default is False.
+        dense : bool
+            If False, the cost matrix is not built and matrice is None, for the engines which only use the pairs. 
+            Default is True.
         """
         super().__init__(grid)
+        self.compact = compact
         n = grid.n 
         m = grid.m 
 
@@ -514,32 +696,92 @@ class SolverHungarian(Solver):
         # Identify even and odd cells based on (i + j) % 2
         self.cases_paires = [(i,j) for i in range(n) for j in range(m) if (i+j)%2 == 0]
         self.cases_impaires = [(i,j) for i in range(n) for j in range(m) if (i+j)%2 == 1]
+        i, j = np.indices((n, m))
+        even = ((i + j) % 2 == 0).ravel()
+        self.indices = np.empty(n * m, dtype=np.int64) # row or column of each cell, instead of list.index
+        self.indices[even] = np.arange(len(self.cases_paires))
+        self.indices[~even] = np.arange(len(self.cases_impaires))
 
         # All pairs of cells in the grid
         self.paires = grid.all_pairs()
 
-        # Initialize cost matrix for assignment
+        if not dense:
+            self.matrice = None
+            return
+
+        # The cost of a pair of values g, h is abs(g - h) - g - h = -2 * min(g, h), and 0 for two cells which are not a pair.
+        # All the costs are shifted by the same value to be non-negative, so the matrix is created with the shift 
+        # and the costs of the pairs are added in one scatter, without any other copy
         y = len(self.cases_paires)
         z = len(self.cases_impaires)
-        self.matrice = np.zeros([y, z])    
-
-        # Fill the cost matrix based on the difference in values
-        for ((a, b), (c, d)) in self.paires:
-            if (a + b) % 2 == 0:
-                g = self.valeurs[a][b]
-                h = self.valeurs[c][d]
-                self.matrice[self.cases_paires.index((a, b))][self.cases_impaires.index((c, d))] = abs(g - h) - g - h
-            if (c + d) % 2 == 0:
-                g = self.valeurs[a][b]
-                h = self.valeurs[c][d]
-                self.matrice[self.cases_paires.index((c, d))][self.cases_impaires.index((a, b))] = abs(g - h) - g - h
-
-        # Shift matrix to ensure all entries are non-negative
-        self.matrice = self.matrice + abs(np.min(self.matrice))
-
-        # If there are more pairs than impairs, pad the matrix with zeros
-        if y > z:
-            self.matrice = np.vstack([self.matrice, np.zeros((y - z, y))])
+        u, v, _ = grid.edge_arrays()
+        value = grid.value_array.ravel()
+        gain = 2 * np.minimum(value[u], value[v])
+        shift = int(gain.max(initial=0))
+        self.matrice = np.full((y, z), shift, dtype=self.matrix_dtype(shift))
+        u_even = even[u]
+        row = self.indices[np.where(u_even, u, v)]
+        col = self.indices[np.where(u_even, v, u)]
+        self.matrice[row, col] = shift - gain
+
+    def matrix_dtype(self, bound: int):
+        """
+        Returns the dtype of a matrix whose entries are integers of absolute value at most bound: 
+        the narrowest signed integer dtype if self.compact, float64 otherwise.
+        """
+        if not self.compact:
+            return np.float64
+        return np.min_scalar_type(-bound - 1)
+
+    def final_solution(self, result):
+        """
+        Finalizes the solution by storing the valid pairs.
+
+        Parameters
+        ----------
+        result : list of tuple
+            The list of valid pairs of cells.
+        """
+        if not result:
+            return
+        cells = np.array(result).reshape(-1, 4) # one row (a, b, c, d) per pair ((a, b), (c, d))
+        valid = self.grid.are_valid_pairs(cells[:, 0], cells[:, 1], cells[:, 2], cells[:, 3])
+        for pair, is_valid in zip(result, valid.tolist()):
+            if is_valid:
+                self.pairs.append(pair)
+
+
+class SolverHungarian(SolverAssignment):
+    """
+    A solver class implementing the Hungarian algorithm for solving the assignment problem 
+    (see SolverAssignment for the attributes and the cost matrix).
+
+    Two engines are available (attribute method):
+    - "textbook": the steps of the Hungarian algorithm on the dense matrix (initialisation, step1, step2, step3).
+    - "vectorized": the same steps, with the same results, written with boolean masks over the matrix 
+      (step1_vectorized, step2_vectorized, step3_vectorized).
+    - "jv": shortest augmenting paths with dual potentials, as in the Jonker-Volgenant algorithm, 
+      on the graph of the pairs only (see shortest_augmenting_paths). It can solve the 100x200 grids.
+    """
+    methods = ("textbook", "vectorized", "jv") # engines available for run
+
+    def __init__(self, grid: Grid, compact=False, method="textbook"):
+        """
+        Initializes the solver using the Hungarian algorithm.
+
+        Parameters
+        ----------
+        grid : Grid
+            The grid object containing the value and color data.
+        compact : bool
+            See SolverAssignment.
+        method : str
+            The engine used by run, "textbook" (default), "vectorized" or "jv". The dense matrix is not built for "jv".
+        """
+        if method not in self.methods:
+            raise Exception(f"Unknown method {method}, the methods are {self.methods}")
+        self.method = method
+        super().__init__(grid, compact=compact, dense=(method != "jv"))
 
     def initialisation(self, M):
         """
@@ -673,19 +915,6 @@ class SolverHungarian(Solver):
                     
         return outlined, slashed
 
-    def final_solution(self, result):
-        """
-        Finalizes the solution by storing the valid pairs.
-
-        Parameters
-        ----------
-        result : list of tuple
-            The list of valid pairs of cells.
-        """
-        for ((a, b), (c, d)) in result:
-            if self.grid.is_valid_pair(a, b, c, d):
-                self.pairs.append(((a, b), (c, d)))
-
     def step2(self, M):
         """
         Executes the second step of the Hungarian algorithm.
@@ -755,6 +984,160 @@ class SolverHungarian(Solver):
                 if i not in marked_row and j in marked_col:
                     M[i, j] += m
 
+    def step1_vectorized(self, M):
+        """
+        Vectorized version of step1, with the same outlined zeros in the same order.
+
+        The slashed cells are a boolean mask instead of a dictionary, and the number of unslashed zeros of each row 
+        (unslashed_zero) is kept up to date when cells are slashed instead of being counted again over the whole matrix.
+
+        Parameters
+        ----------
+        M : ndarray
+            The cost matrix.
+
+        Returns
+        -------
+        tuple
+            A tuple containing two elements:
+            - outlined : dict
+                A dictionary of marked cells, as returned by step1.
+            - slashed : ndarray or bool
+                The boolean mask of the blocked cells, or True if all the rows are outlined.
+        """
+        s = M.shape[0]
+        zero = (M == 0)
+        slashed = np.zeros((s, s), dtype=bool)
+        counts = zero.sum(axis=1) # the values of unslashed_zero(M, slashed), 0 for the rows which are not in it
+        visited = np.zeros(s, dtype=bool)
+        outlined = {}
+
+        def index_min(): # index_min(unslashed_zero(M, slashed), visited)
+            d = np.where(~visited & (counts > 0), counts, 10000)
+            row = int(np.argmin(d)) # first row with the fewest zeros
+            return row if d[row] < 10000 else -1
+
+        while True:
+            row = index_min()
+            visited[row] = True
+
+            # Outline the first unslashed zero of the row, then slash the other zeros of its row and of its column
+            free = zero[row] & ~slashed[row]
+            progress = bool(free.any())
+            if progress:
+                col = int(np.argmax(free))
+                outlined[(row, col)] = True
+                free[col] = False
+                slashed[row] |= free
+                counts[row] -= free.sum()
+                new = zero[:, col] & ~slashed[:, col]
+                new[row] = False
+                slashed[:, col] |= new
+                counts -= new
+
+            if len(outlined) == s:
+                return outlined, True
+            if index_min() == -1 or not progress:
+                return outlined, slashed
+
+    def step2_vectorized(self, M, outlined, slashed):
+        """
+        Vectorized version of step2, from the output of step1_vectorized(M).
+
+        Returns
+        -------
+        tuple
+            The boolean masks (marked_row, marked_col) of the rows and columns marked by step2.
+        """
+        marked_row = np.ones(M.shape[0], dtype=bool) # rows without any outlined zero
+        marked_row[[i for (i, j) in outlined]] = False
+        marked_col = slashed[marked_row].any(axis=0) # columns of the slashed cells of the marked rows
+        return marked_row, marked_col
+
+    def step3_vectorized(self, M, marked_row, marked_col):
+        """
+        Vectorized version of step3, from the output of step2_vectorized: subtracts the minimum m of the marked rows 
+        and unmarked columns from these cells and adds it to the cells of the unmarked rows and marked columns.
+        """
+        block = M[np.ix_(marked_row, ~marked_col)]
+        m = min(100000, block.min()) if block.size else 100000
+        M[np.ix_(marked_row, ~marked_col)] -= m
+        M[np.ix_(~marked_row, marked_col)] += m
+
+    def shortest_augmenting_paths(self) -> tuple[list, list]:
+        """
+        Solves the assignment problem with shortest augmenting paths and dual potentials (Jonker-Volgenant), 
+        using only the pairs of the grid (see Grid.adjacency).
+
+        The rows are the even cells which are in a pair. A row can be assigned to one of its odd neighbours, 
+        at the cost -2 * min(g, h), or to its own dummy column at the cost 0 (the cell stays alone), so that every row 
+        is assigned. Each column j has a potential v[j], and the reduced cost of a pair (i, j) is cost(i, j) - v[j] minus 
+        its minimum over the columns of i, which is reached by the column assigned to i. 
+        The rows are assigned one after the other: a Dijkstra search from the new row over the reduced costs 
+        (heap, O(E log V)) stops at the first free column, the potentials of the columns reached before it are updated 
+        so that the reduced costs stay non-negative, and the assignment is augmented along the path.
+
+        Returns
+        -------
+        tuple
+            Two lists (u, v): the pairs of the solution are (u[k], v[k]), u[k] being the even cell, as flat indices.
+        """
+        nm = self.grid.n * self.grid.m
+        indptr, indices, _ = self.grid.adjacency()
+        value = self.grid.value_array.ravel()
+        degree = np.diff(indptr)
+        source = np.repeat(np.arange(nm), degree)
+        costs = (-2 * np.minimum(value[source], value[indices])).tolist()
+        i, j = np.indices((self.grid.n, self.grid.m))
+        rows = np.flatnonzero(((i + j) % 2 == 0).ravel() & (degree > 0)).tolist()
+        indptr, indices = indptr.tolist(), indices.tolist()
+
+        # Columns: the odd cells c (c < nm) and the dummy column nm + r of each row r
+        def neighbours(r): # columns of the row r and their costs
+            return list(zip(indices[indptr[r]:indptr[r + 1]], costs[indptr[r]:indptr[r + 1]])) + [(nm + r, 0)]
+
+        v = [0] * (2 * nm)                 # potentials of the columns
+        row_of = [-1] * (2 * nm)           # row assigned to each column, -1 if the column is free
+        column_of, cost_of = {}, {}        # column assigned to each row and its cost
+        for f in rows:
+            dist, pred = {}, {}            # distance of the columns from f, and row from which they are reached
+            heap = []
+            for (col, c) in neighbours(f):
+                dist[col], pred[col] = c - v[col], (f, c)
+                heappush(heap, (dist[col], col))
+            ready = []                     # columns whose distance is final
+            done = set()
+            while True:
+                d, col = heappop(heap)
+                if col in done or d > dist[col]:
+                    continue
+                if row_of[col] == -1:      # free column: shortest augmenting path found
+                    end, shortest = col, d
+                    break
+                done.add(col)
+                ready.append(col)
+                r = row_of[col]            # the path goes on through the row assigned to col
+                base = d - (cost_of[r] - v[col])
+                for (col2, c) in neighbours(r):
+                    if col2 not in done:
+                        d2 = base + c - v[col2]
+                        if d2 < dist.get(col2, inf):
+                            dist[col2], pred[col2] = d2, (r, c)
+                            heappush(heap, (d2, col2))
+            for col in ready: # keeps the reduced costs of the pairs non-negative and those of the assigned pairs zero
+                v[col] += dist[col] - shortest
+            col = end
+            while True: # augments along the path, from its end
+                r, c = pred[col]
+                previous = column_of.get(r)
+                column_of[r], cost_of[r], row_of[col] = col, c, r
+                if r == f:
+                    break
+                col = previous
+
+        pairs = [(r, column_of[r]) for r in rows if column_of[r] < nm] # rows with a dummy column stay alone
+        return [r for (r, c) in pairs], [c for (r, c) in pairs]
+
     def run(self):
         """
         Solves the assignment problem using the Hungarian algorithm.
@@ -762,22 +1145,37 @@ class SolverHungarian(Solver):
         The method performs the necessary steps to compute the optimal assignment, 
         including matrix initialization and applying the Hungarian algorithm steps iteratively.
         """
-        M = np.array(self.matrice)
-        M_work = np.copy(M)
+        if self.method == "jv":
+            self.pairs = self.grid.ids_to_pairs(*self.shortest_augmenting_paths())
+            return
+
+        # The algorithm modifies a square matrix: the working copy gets columns of zeros for the even cells left alone.
+        # Its entries can grow (step3 adds to some of them), but no more than the total of the steps, i.e. the optimal cost
+        y, z = self.matrice.shape
+        M_work = np.zeros((y, y), dtype=self.matrix_dtype((y + 1) * int(self.matrice.max(initial=0))))
+        M_work[:, :z] = self.matrice
         
         # Initialize the matrix
         self.initialisation(M_work)
 
         # Iteratively apply the Hungarian algorithm steps
-        while self.step1(M_work)[1] != True:
-            self.step3(M_work)
+        if self.method == "vectorized":
+            outlined, slashed = self.step1_vectorized(M_work)
+            while slashed is not True:
+                self.step3_vectorized(M_work, *self.step2_vectorized(M_work, outlined, slashed))
+                outlined, slashed = self.step1_vectorized(M_work)
+        else:
+            while self.step1(M_work)[1] != True:
+                self.step3(M_work)
+            outlined = self.step1(M_work)[0]
 
         # Extract the result from the outlined pairs
-        outlined = self.step1(M_work)[0]
         pairs_list = list(outlined.keys())
         result = []
 
         for (i, j) in pairs_list:
+            if j >= z: # column added to make the matrix square, the cell i stays alone
+                continue
             result.append(((self.cases_paires[i][0], self.cases_paires[i][1]), 
                            (self.cases_impaires[j][0], self.cases_impaires[j][1])))
 
@@ -786,28 +1184,61 @@ class SolverHungarian(Solver):
 
 
 
-class SolverScipy(Solver):#We implement the solver using the linear_sum_assignment function from the scipy library to compare 
+class SolverScipy(SolverAssignment):#We implement the solver using the linear_sum_assignment function from the scipy library to compare 
+    """
+    A solver class using the SciPy library's linear_sum_assignment function for solving the assignment problem 
+    (see SolverAssignment for the attributes and the cost matrix).
     """
-    A solver class using the SciPy library's linear_sum_assignment function for solving the assignment problem.
+    def __init__(self, grid: Grid):
+        """
+        Initializes the solver with a float64 cost matrix: linear_sum_assignment copies any other dtype to float64, 
+        so a compact matrix would only add this copy.
+
+        Parameters
+        ----------
+        grid : Grid
+            The grid object containing the value and color data.
+        """
+        super().__init__(grid)
+
+    def run(self):
+        """
+        Solves the assignment problem using the SciPy linear_sum_assignment function.
+
+        The method computes the optimal assignment by solving the linear sum assignment problem 
+        using the scipy.optimize.linear_sum_assignment function, which solves rectangular problems directly: 
+        the even cells whose row is not assigned stay alone.
+        """
+        lignes, colonnes = linear_sum_assignment(self.matrice)
+        result = list([(self.cases_paires[lignes[i]],self.cases_impaires[colonnes[i]]) for i in range(len(lignes))])
+        self.final_solution(result)
+
+
+class SolverSparse(Solver):
+    """
+    A solver class solving the same assignment problem as SolverScipy on a sparse matrix, 
+    with scipy.sparse.csgraph.min_weight_full_bipartite_matching.
+
+    Only the valid pairs are stored, so the memory is linear in the size of the grid 
+    (SolverScipy builds a dense matrix of size (n*m/2)^2, 800 MB for a 100x200 grid).
+
+    Each even cell of a pair is a row and each odd cell of a pair a column. A row can also be matched to its own dummy column, 
+    which means that the cell stays alone. All the rows are matched, so the weights must make the minimum full matching 
+    a maximum of the sum of 2*min(value(c1), value(c2)) over the pairs: with K = 2*max(value) + 1, 
+    a pair weighs K - 2*min(value(c1), value(c2)) and a dummy weighs K, all of them being positive.
 
     Attributes
     ----------
-    valeurs : ndarray
-        The grid of values.
-    couleurs : ndarray
-        The grid of colors.
-    cases_paires : list of tuple
-        List of coordinates for the even cells (i + j) % 2 == 0.
-    cases_impaires : list of tuple
-        List of coordinates for the odd cells (i + j) % 2 == 1.
-    paires : list of tuple
-        All pairs of cells in the grid.
-    matrice : ndarray
-        The matrix representing the cost of matching even and odd cells.
+    cases_paires : ndarray
+        Flat indices of the even cells (i + j) % 2 == 0 which are in at least one pair (the rows).
+    cases_impaires : ndarray
+        Flat indices of the odd cells (i + j) % 2 == 1 which are in at least one pair (the first columns).
+    matrice : csr_matrix
+        The sparse matrix of size len(cases_paires) x (len(cases_impaires) + len(cases_paires)) of the weights.
     """
     def __init__(self, grid : Grid):
         """
-        Initializes the solver using the SciPy linear sum assignment.
+        Initializes the solver with the sparse matrix of the weights.
 
         Parameters
         ----------
@@ -815,56 +1246,307 @@ class SolverScipy(Solver):#We implement the solver using the linear_sum_assignme
             The grid object containing the value and color data.
         """
         super().__init__(grid)
-        n = grid.n 
-        m = grid.m 
+        u, v, _ = grid.edge_arrays()
+        i, j = grid.cell_of(u)
+        u_even = (i + j) % 2 == 0
+        even = np.where(u_even, u, v) # each pair as (even cell, odd cell)
+        odd = np.where(u_even, v, u)
+
+        self.cases_paires = np.unique(even)
+        self.cases_impaires = np.unique(odd)
+        y = len(self.cases_paires)
+        z = len(self.cases_impaires)
+        value = grid.value_array.ravel()
+        K = 2 * int(value.max(initial=0)) + 1
 
-        self.valeurs=grid.value
-        self.couleurs=grid.color
+        rows = np.concatenate((np.searchsorted(self.cases_paires, even), np.arange(y)))
+        columns = np.concatenate((np.searchsorted(self.cases_impaires, odd), z + np.arange(y)))
+        weights = np.concatenate((K - 2 * np.minimum(value[even], value[odd]).astype(np.int64), np.full(y, K, dtype=np.int64)))
+        self.matrice = csr_matrix((weights, (rows, columns)), shape=(y, z + y))
 
-        self.cases_paires = [(i,j) for i in range(n) for j in range(m) if (i+j)%2==0]
-        self.cases_impaires = [(i,j) for i in range(n) for j in range(m) if (i+j)%2==1]
+    def run(self):
+        """
+        Solves the assignment problem with min_weight_full_bipartite_matching. 
+        The pairs are given as (even cell, odd cell), ordered by even cell like those of SolverScipy.
+        """
+        if self.matrice.shape[0] == 0: # no valid pair
+            return
+        lignes, colonnes = min_weight_full_bipartite_matching(self.matrice)
+        matched = colonnes < len(self.cases_impaires) # the rows matched with a dummy column stay alone
+        order = np.argsort(lignes[matched])
+        u = self.cases_paires[lignes[matched][order]]
+        v = self.cases_impaires[colonnes[matched][order]]
+        self.pairs = self.grid.ids_to_pairs(u, v)
 
-        self.paires = grid.all_pairs()
 
-        y = len(self.cases_paires)
-        z = len(self.cases_impaires)
-        self.matrice = np.zeros([y,z])     #plus de cases paires qu'impaires
-
-        for ((a,b),(c,d)) in self.paires :
-            if (a+b)%2==0:
-                g = self.valeurs[a][b]
-                h = self.valeurs[c][d]
-                self.matrice[self.cases_paires.index((a,b))][self.cases_impaires.index((c,d))]=abs(g-h)-g-h
-            if (c+d)%2==0:
-                g = self.valeurs[a][b]
-                h = self.valeurs[c][d]
-                self.matrice[self.cases_paires.index((c,d))][self.cases_impaires.index((a,b))]=abs(g-h)-g-h
-
-        self.matrice = self.matrice + abs(np.min(self.matrice))
-        if y>z:
-            self.matrice = np.vstack([self.matrice, np.zeros((y-z,y))])
-            
-    def final_solution(self,result):
+class SolverMinCostFlow(Solver):
+    """
+    A solver class computing an optimal solution as a minimum cost flow on the graph of the pairs, 
+    with successive shortest paths and potentials.
+
+    The network has a node for each cell and a sink. Each even cell receives one unit of flow from the source 
+    and sends it to the sink, either through one of its odd neighbours (arc of cost -2 * min(g, h) for the values g, h 
+    of the pair, then arc odd cell -> sink of cost 0) or directly (arc of cost 0: the cell stays alone at its value). 
+    All the arcs have a capacity 1, so a flow is a set of pairs, and its cost is the score minus the sum of the values.
+
+    Only the arcs are stored, as arrays in CSR format, so the memory is linear in n*m.
+
+    Attributes
+    ----------
+    grid : Grid
+        The grid object containing the value and color data.
+    pairs : list of tuple
+        A list of pairs of cells representing the solution.
+    """
+
+    def network(self):
         """
-        Finalizes the solution by adding valid pairs to the list of pairs.
+        Builds the residual network. The arc 2k is the k-th arc of the network and the arc 2k + 1 is its reverse arc, 
+        of capacity 0 and opposite cost, so the reverse of the arc e is e ^ 1.
+
+        Returns
+        -------
+        tuple
+            (rows, sink, head, cost, capacity, first, arcs): the even cells which send a unit of flow, the sink node, 
+            the head, cost and residual capacity of each arc, and the arcs leaving each node x, 
+            arcs[first[x]:first[x + 1]].
+        """
+        nm = self.grid.n * self.grid.m
+        u, v, _ = self.grid.edge_arrays()
+        value = self.grid.value_array.ravel()
+        i, j = self.grid.cell_of(u)
+        u_even = (i + j) % 2 == 0
+        even = np.where(u_even, u, v)
+        odd = np.where(u_even, v, u)
+        rows = np.unique(even)
+        sink = nm
+        # Arcs of the network: even -> odd for each pair, even -> sink and odd -> sink
+        tail = np.concatenate((even, rows, np.unique(odd)))
+        head = np.concatenate((odd, np.full(len(tail) - len(even), sink)))
+        cost = np.concatenate((-2 * np.minimum(value[even], value[odd]).astype(np.int64), np.zeros(len(tail) - len(even), dtype=np.int64)))
+        # Reverse arcs, interleaved
+        tail, head = np.column_stack((tail, head)).ravel(), np.column_stack((head, tail)).ravel()
+        cost = np.column_stack((cost, -cost)).ravel()
+        capacity = np.tile([1, 0], len(cost) // 2)
+        arcs = np.argsort(tail, kind="stable")
+        first = np.zeros(nm + 2, dtype=np.int64)
+        np.cumsum(np.bincount(tail, minlength=nm + 1), out=first[1:])
+        return rows.tolist(), sink, head.tolist(), cost.tolist(), capacity.tolist(), first.tolist(), arcs.tolist()
+
+    def run(self):
+        """
+        Solves the grid with successive shortest paths.
+
+        The units of flow of the even cells are sent one after the other along a shortest path to the sink in the residual 
+        network, found with Dijkstra for the reduced costs cost(e) + pi[tail(e)] - pi[head(e)]. The potentials pi keep 
+        these reduced costs non-negative: they start as the distances from the source in the network without flow 
+        (which has no cycle) and the distances found by each search are added to them. As every unit of flow 
+        goes along a shortest path, the flow has a minimum cost at each step.
+        """
+        rows, sink, head, cost, capacity, first, arcs = self.network()
+        if not rows:
+            return
+        pi = [0] * (sink + 1)
+        for e in range(0, len(cost), 2): # initial potentials: arcs even -> odd, then odd -> sink and even -> sink
+            pi[head[e]] = min(pi[head[e]], pi[head[e ^ 1]] + cost[e])
+
+        for a in rows:
+            # Dijkstra from a, stopped when the sink is reached
+            dist, pred = {a: 0}, {}
+            heap = [(0, a)]
+            settled = []
+            while True:
+                d, x = heappop(heap)
+                if d > dist[x]:
+                    continue
+                if x == sink:
+                    break
+                settled.append(x)
+                for e in arcs[first[x]:first[x + 1]]:
+                    if capacity[e]:
+                        y = head[e]
+                        d2 = d + cost[e] + pi[x] - pi[y]
+                        if d2 < dist.get(y, inf):
+                            dist[y], pred[y] = d2, e
+                            heappush(heap, (d2, y))
+            for x in settled: # the nodes which are not settled are at distance >= d: their reduced costs stay >= 0
+                pi[x] += dist[x] - d
+            # Sends the unit of flow along the path
+            y = sink
+            while y != a:
+                e = pred[y]
+                capacity[e] -= 1
+                capacity[e ^ 1] += 1
+                y = head[e ^ 1]
+
+        pairs = [(head[e ^ 1], head[e]) for e in range(0, len(cost), 2) if capacity[e] == 0 and head[e] != sink]
+        pairs.sort()
+        self.pairs = self.grid.ids_to_pairs([a for (a, b) in pairs], [b for (a, b) in pairs])
+
+
+class SolverLP(Solver):
+    """
+    A solver class solving the problem as a linear program with the HiGHS solver of scipy.optimize.linprog.
+
+    There is one variable x[e] in [0, 1] per pair e of the grid (in the order of Grid.edge_arrays), of cost -2 * min(g, h) 
+    for the values g, h of its cells, and one constraint per cell: the sum of the variables of its pairs is at most 1. 
+    The matching polytope of a bipartite graph is integral, so the optimal vertex found by HiGHS is a set of pairs.
+
+    Attributes
+    ----------
+    grid : Grid
+        The grid object containing the value and color data.
+    pairs : list of tuple
+        A list of pairs of cells representing the solution.
+    duals : ndarray
+        After run, the optimal dual solution: duals[i*m + j] >= 0 is the price of the constraint of the cell (i, j), 
+        with duals[c1] + duals[c2] >= 2 * min(g, h) for every pair (c1, c2) of values g, h.
+    """
+
+    def __init__(self, grid: Grid):
+        """
+        Initializes the solver.
 
         Parameters
         ----------
-        result : list of tuple
-            The list of pairs that represent the solution.
+        grid : Grid
+            The grid object containing the value and color data.
+        """
+        super().__init__(grid)
+        self.duals = None
+
+    def constraints(self):
+        """
+        Returns the matrix of the constraints in CSR format, of shape (n*m, number of pairs): 
+        the row of a cell has a 1 in the column of each of its pairs.
         """
-        for ((a,b),(c,d)) in result:
-            if self.grid.is_valid_pair(a,b,c,d):
-                self.pairs.append(((a,b),(c,d)))
-                
+        u, v, _ = self.grid.edge_arrays()
+        E = len(u)
+        rows = np.concatenate((u, v))
+        columns = np.concatenate((np.arange(E), np.arange(E)))
+        return csr_matrix((np.ones(2 * E), (rows, columns)), shape=(self.grid.n * self.grid.m, E))
+
     def run(self):
         """
-        Solves the assignment problem using the SciPy linear_sum_assignment function.
+        Solves the linear program with HiGHS, then rounds the solution and checks that it is a set of disjoint pairs.
+        Raises an Exception if HiGHS fails or if the solution is not integral.
+        """
+        u, v, _ = self.grid.edge_arrays()
+        if len(u) == 0:
+            self.duals = np.zeros(self.grid.n * self.grid.m)
+            return
+        value = self.grid.value_array.ravel()
+        cost = -2 * np.minimum(value[u], value[v]).astype(np.float64)
+        A = self.constraints()
+        # x[e] <= 1 follows from the constraints, so only x[e] >= 0 is given as a bound
+        result = linprog(cost, A_ub=A, b_ub=np.ones(A.shape[0]), bounds=(0, None), method="highs")
+        if result.status != 0:
+            raise Exception(f"The linear program could not be solved: {result.message}")
+
+        x = np.round(result.x)
+        if np.abs(result.x - x).max() > 1e-6:
+            raise Exception("The solution of the linear program is not integral")
+        if (A @ x).max() > 1:
+            raise Exception("A cell is in two pairs of the solution of the linear program")
+        taken = np.flatnonzero(x == 1)
+        self.pairs = self.grid.ids_to_pairs(u[taken], v[taken])
+        self.duals = -result.ineqlin.marginals
+
+    def dual_bound(self) -> int:
+        """
+        Returns the lower bound of the score given by the dual solution: total_value() minus the sum of the duals 
+        (no solution can score less, and the optimal solution scores exactly this). run must have been called.
+        """
+        return int(np.ceil(self.grid.total_value() - self.duals.sum() - 1e-6))
 
-        The method computes the optimal assignment by solving the linear sum assignment problem 
-        using the scipy.optimize.linear_sum_assignment function.
+
+class SolverComponents(Solver):
+    """
+    A solver class which splits the grid into the connected components of the graph of its pairs and solves each one 
+    separately with another solver, then merges their pairs.
+
+    Black cells and incompatible colors split most grids into many small independent regions (grid21 to grid29 have 
+    about 700 components of at most a few hundred cells), so solving them one by one is much cheaper for the solvers 
+    which are quadratic or worse, e.g. SolverScipy builds about 700 small matrices instead of a 10000 x 10000 one. 
+    The cells without any pair are left alone (their value counts in the score) and a component of two cells 
+    is its single pair, without calling the solver.
+
+    Attributes
+    ----------
+    grid : Grid
+        The grid object containing the value and color data.
+    pairs : list of tuple
+        A list of pairs of cells representing the solution.
+    solver : class
+        The class of the solver used for each component, e.g. SolverScipy.
+    options : dict
+        Keyword arguments given to the solver of each component, e.g. {"method": "jv"} for SolverHungarian.
+    """
+
+    def __init__(self, grid: Grid, solver=SolverSparse, **options):
         """
-        M = np.array(self.matrice)
-        lignes, colonnes = linear_sum_assignment(M)
-        result = list([(self.cases_paires[lignes[i]],self.cases_impaires[colonnes[i]]) for i in range(len(lignes))])
-        self.final_solution(result)
+        Initializes the solver.
+
+        Parameters
+        ----------
+        grid : Grid
+            The grid object containing the value and color data.
+        solver : class
+            The class of the solver used for each component (default SolverSparse).
+        options : dict
+            Keyword arguments given to the solver of each component.
+        """
+        super().__init__(grid)
+        self.solver = solver
+        self.options = options
+
+    def components(self) -> list:
+        """
+        Returns the connected components of the graph of the pairs which have at least two cells, 
+        as arrays of flat indices i*m + j, ordered by their first cell.
+        """
+        nm = self.grid.n * self.grid.m
+        indptr, indices, _ = self.grid.adjacency()
+        graph = csr_matrix((np.ones(len(indices), dtype=np.int8), indices, indptr), shape=(nm, nm))
+        _, labels = connected_components(graph, directed=False)
+        cells = np.flatnonzero(np.diff(indptr) > 0) # the cells without any pair are left alone
+        labels = labels[cells]
+        order = np.argsort(labels, kind="stable")
+        components = np.split(cells[order], np.flatnonzero(np.diff(labels[order])) + 1)
+        return sorted((c for c in components if len(c) > 0), key=lambda c: c[0])
+
+    def subgrid(self, component, color=None, value=None):
+        """
+        Returns the smallest grid containing the cells of the component, in which the other cells are black, 
+        and the position (i0, j0) of its cell (0, 0) in the grid.
+
+        color and value are the arrays self.grid.color_array and self.grid.value_array, read once by run for all 
+        the components: they are converted again at each read when the grid is list-backed.
+        """
+        if color is None:
+            color = self.grid.color_array
+        if value is None:
+            value = self.grid.value_array
+        i, j = self.grid.cell_of(component)
+        i0, i1, j0, j1 = int(i.min()), int(i.max()) + 1, int(j.min()), int(j.max()) + 1 # ints, so the pairs are tuples of ints
+        sub_color = np.full((i1 - i0, j1 - j0), 4, dtype=color.dtype)
+        sub_color[i - i0, j - j0] = color[i, j]
+        sub_value = np.array(value[i0:i1, j0:j1])
+        return Grid(i1 - i0, j1 - j0, sub_color, sub_value), i0, j0
+
+    def run(self):
+        """
+        Solves each component with the solver and merges the pairs, translated back to the coordinates of the grid.
+        """
+        m = self.grid.m
+        color, value = self.grid.color_array, self.grid.value_array # read once, not for each component
+        self.pairs = []
+        for component in self.components():
+            if len(component) == 2: # a single pair, which never increases the score
+                a, b = component.tolist()
+                self.pairs.append(((a // m, a % m), (b // m, b % m)))
+                continue
+            grid, i0, j0 = self.subgrid(component, color, value)
+            solver = self.solver(grid, **self.options)
+            solver.run()
+            self.pairs += [((a + i0, b + j0), (c + i0, d + j0)) for ((a, b), (c, d)) in solver.pairs]